@@ -35,7 +35,7 @@ def load(seed, exp):
     p = SEED_DIRS[seed] / exp / "latency_log.jsonl"
     if not p.exists():
         return []
-    return [json.loads(l) for l in p.read_text().splitlines() if l.strip()]
+    return [json.loads(l) for l in p.read_bytes().splitlines() if l]
 
 def pool(exp):
     """Pool all rows from all seeds for one experiment."""
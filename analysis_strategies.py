@@ -17,7 +17,7 @@ OUT_DIR.mkdir(exist_ok=True)
 def load(exp):
     p = BASE / exp / "latency_log.jsonl"
     if not p.exists(): return []
-    return [json.loads(l) for l in p.read_text().splitlines() if l.strip()]
+    return [json.loads(l) for l in p.read_bytes().splitlines() if l]
 
 # ── strategies ────────────────────────────────────────────────────────────
 
@@ -12,15 +12,129 @@ The sync_gap (time waiting for the slower stream) dominates at low delay.
 
 Usage:
   python3 analyze_latency.py latency_log.jsonl --outdir plots
+  python3 analyze_latency.py latency_log.jsonl --summary-only   # stats only, no matplotlib
 """
 
 from __future__ import annotations
 import argparse
-import json
 import os
-from typing import Dict, Any, List
-
-import matplotlib.pyplot as plt
+from typing import Dict, Any, Tuple
+
+import numpy as np
+
+try:
+    import orjson as _json    # optional: several times faster on large logs
+except ImportError:
+    import json as _json
+
+
+DPI = 150  # output resolution, same as the other analysis scripts
+
+# Fields read from each latency_log.jsonl record: (dtype, fill value used
+# when a record lacks the key or logs it as null, e.g. distance -> NaN).
+LOG_FIELDS: Dict[str, Tuple[str, Any]] = {
+    "e2e_ms":               ("f8", np.nan),
+    "thermal_proc_ns":      ("i8", 0),
+    "imagery_proc_ns":      ("i8", 0),
+    "thermal_net_ns":       ("i8", 0),
+    "imagery_net_ns":       ("i8", 0),
+    "fusion_proc_ns":       ("i8", 0),
+    "raw_signal":           ("?",  False),
+    "decision":             ("?",  False),
+    "window_confirmations": ("i4", 0),
+    "fire_confirm_k":       ("i4", 3),
+    "fire_window":          ("?",  False),
+    "thermal_distance_m":   ("f8", np.nan),
+    "imagery_distance_m":   ("f8", np.nan),
+}
+
+
+def load_columns(path: str) -> np.ndarray:
+    """
+    Parse latency_log.jsonl into one NumPy structured array.
+
+    One fixed-size record per fusion event (~60 B instead of a ~500 B dict);
+    columns are read as arr["e2e_ms"] etc.  The dtype holds the fields that
+    appear in any record (records lacking one get its LOG_FIELDS fill), so
+    logs from earlier phases simply lack the later columns (check
+    arr.dtype.names).  Empty log -> empty array.
+    """
+    # Read the whole log as bytes and parse line by line: both orjson and
+    # stdlib json accept bytes, so no per-line decode is needed.
+    with open(path, "rb") as f:
+        data = f.read()
+    rows = [_json.loads(l) for l in data.splitlines() if l]
+    if not rows:
+        return np.empty(0, dtype=[])
+
+    n = len(rows)
+    seen = set()
+    for r in rows:
+        seen.update(r)
+    fields = [k for k in LOG_FIELDS if k in seen]
+    arr = np.empty(n, dtype=[(k, LOG_FIELDS[k][0]) for k in fields])
+    for key in fields:
+        dtype, fill = LOG_FIELDS[key]
+        # fromiter with a known count fills one preallocated buffer in C,
+        # with no intermediate Python list.  A missing key and a JSON null
+        # both take the fill (an i8 column cannot hold None).
+        arr[key] = np.fromiter(
+            (fill if (v := r.get(key)) is None else v for r in rows), dtype=dtype, count=n)
+    return arr
+
+
+def ns_to_ms(ns: np.ndarray) -> np.ndarray:
+    """
+    Integer ns column -> float32 ms.  Five significant digits are plenty for
+    plots and summaries, and float32 halves the memory the reductions touch.
+    """
+    return ns.astype(np.float32) * np.float32(1e-6)
+
+
+def summarize_components(t_proc, i_proc, t_net, i_net, f_proc, e2e):
+    """
+    Per-event component sums over whole columns (also used by compare_runs,
+    so both tools share one definition of the sync gap).
+
+    Returns (net, proc, sync_gap) per-event ms arrays.  A NaN e2e_ms (missing
+    in the record) stays NaN in sync_gap, so a nanmean over it skips that event.
+    """
+    net      = t_net + i_net
+    proc     = t_proc + i_proc + f_proc
+    sync_gap = np.maximum(0.0, e2e - (net + proc))
+    return net, proc, sync_gap
+
+
+def hit_miss_stats(fw: np.ndarray, dec: np.ndarray) -> Tuple[int, int, int, int, float, float, float, float]:
+    """
+    Decision vs fire_window ground truth.
+
+    Returns (TP, FN, FP, TN, recall, precision, false-alarm rate, miss rate);
+    rates are NaN when their denominator is zero.
+    """
+    TP = int(np.count_nonzero( fw &  dec))
+    FN = int(np.count_nonzero( fw & ~dec))
+    FP = int(np.count_nonzero(~fw &  dec))
+    TN = int(np.count_nonzero(~fw & ~dec))
+
+    total_fire    = TP + FN
+    total_no_fire = TN + FP
+    recall        = TP / total_fire    if total_fire    > 0 else float("nan")
+    precision     = TP / (TP + FP)    if (TP + FP)     > 0 else float("nan")
+    fpr           = FP / total_no_fire if total_no_fire > 0 else float("nan")
+    miss_rate     = FN / total_fire    if total_fire    > 0 else float("nan")
+    return TP, FN, FP, TN, recall, precision, fpr, miss_rate
+
+
+def print_hit_miss(stats, label: str) -> None:
+    TP, FN, FP, TN, recall, precision, fpr, miss_rate = stats
+    print(f"\nFire Window Hit/Miss{label}:")
+    print(f"  Fire events (TP+FN)  : {TP + FN}")
+    print(f"  Hits (TP)            : {TP}   ({100*recall:.1f}% recall / hit-rate)")
+    print(f"  Misses (FN)          : {FN}   ({100*miss_rate:.1f}% miss-rate)")
+    print(f"  False alarms (FP)    : {FP}   ({100*fpr:.1f}% false-alarm rate)")
+    print(f"  True quiet (TN)      : {TN}")
+    print(f"  Precision            : {100*precision:.1f}%")
 
 
 def parse_args() -> argparse.Namespace:
@@ -28,101 +142,129 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("jsonl", help="Path to latency_log.jsonl")
     p.add_argument("--outdir", default="plots", help="Output directory for plots")
     p.add_argument("--label", default="", help="Optional run label for plot titles")
+    p.add_argument("--summary-only", action="store_true",
+                   help="Print the statistics and exit without plotting")
     return p.parse_args()
 
 
-def percentile(xs: List[float], p: float) -> float:
-    if not xs:
-        return float("nan")
-    xs = sorted(xs)
-    k = int(round((p / 100.0) * (len(xs) - 1)))
-    k = max(0, min(k, len(xs) - 1))
-    return xs[k]
-
-
-def mean(xs: List[float]) -> float:
-    return sum(xs) / max(1, len(xs))
-
-
 def main() -> None:
     args = parse_args()
-    os.makedirs(args.outdir, exist_ok=True)
     label = f" ({args.label})" if args.label else ""
 
-    rows: List[Dict[str, Any]] = []
-    with open(args.jsonl, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            rows.append(json.loads(line))
-
-    if not rows:
+    cols = load_columns(args.jsonl)
+    if len(cols) == 0:
         print("No rows found.")
         return
 
-    e2e_ms        = [float(r["e2e_ms"]) for r in rows if "e2e_ms" in r]
-    t_proc_ms     = [r.get("thermal_proc_ns", 0) / 1e6 for r in rows]
-    i_proc_ms     = [r.get("imagery_proc_ns", 0) / 1e6 for r in rows]
-    t_net_ms      = [r.get("thermal_net_ns", 0) / 1e6 for r in rows]
-    i_net_ms      = [r.get("imagery_net_ns", 0) / 1e6 for r in rows]
-    f_proc_ms     = [r.get("fusion_proc_ns", 0) / 1e6 for r in rows]
+    n     = len(cols)
+    names = cols.dtype.names
+
+    def col(key: str, default: np.ndarray) -> np.ndarray:
+        return cols[key] if key in names else default
+
+    def ms(key: str) -> np.ndarray:
+        return ns_to_ms(cols[key]) if key in names else np.zeros(n, dtype=np.float32)
+
+    e2e_ms    = cols["e2e_ms"]
+    has_e2e   = ~np.isnan(e2e_ms)  # records logged without e2e_ms are NaN
+    t_proc_ms = ms("thermal_proc_ns")
+    i_proc_ms = ms("imagery_proc_ns")
+    t_net_ms  = ms("thermal_net_ns")
+    i_net_ms  = ms("imagery_net_ns")
+    f_proc_ms = ms("fusion_proc_ns")
 
     # Inter-stream sync gap: the dominant component not captured by individual measurements.
     # E2E starts from min(thermal_tx, imagery_tx). The gap = E2E minus all measured parts.
-    measured_ms   = [tp + ip + tn + in_ + fp
-                     for tp, ip, tn, in_, fp
-                     in zip(t_proc_ms, i_proc_ms, t_net_ms, i_net_ms, f_proc_ms)]
-    sync_gap_ms   = [max(0.0, e - m) for e, m in zip(e2e_ms, measured_ms)]
+    net_ms, proc_ms, sync_gap_ms = summarize_components(
+        t_proc_ms, i_proc_ms, t_net_ms, i_net_ms, f_proc_ms, e2e_ms)
+
+    # All summary means in one reduction over an (n, 7) component matrix;
+    # nanmean skips records whose e2e_ms was missing (NaN fill).
+    comp = np.column_stack(
+        (e2e_ms, sync_gap_ms, t_net_ms, i_net_ms, t_proc_ms, i_proc_ms, f_proc_ms))
+    (e2e_mean, sync_mean, t_net_mean, i_net_mean,
+     t_proc_mean, i_proc_mean, f_proc_mean) = np.nanmean(comp, axis=0).tolist()
+
+    no_flags = np.zeros(n, dtype=bool)
+    raw      = col("raw_signal", no_flags)
+    decision = col("decision", no_flags)
 
-    raw      = [r.get("raw_signal", False) for r in rows]
-    decision = [r.get("decision", False) for r in rows]
+    # One sort for all three percentiles; "nearest" keeps the rank-based
+    # definition used in earlier reports (no interpolation between samples).
+    # nanpercentile skips records without e2e_ms, like the nanmean above.
+    p50, p95, p99 = np.nanpercentile(e2e_ms, [50, 95, 99], method="nearest")
 
     print(f"Summary{label}:")
-    print(f"  events         : {len(e2e_ms)}")
-    print(f"  e2e mean       : {mean(e2e_ms):.2f} ms")
-    print(f"  e2e median     : {percentile(e2e_ms, 50):.2f} ms")
-    print(f"  e2e p95        : {percentile(e2e_ms, 95):.2f} ms")
-    print(f"  e2e p99        : {percentile(e2e_ms, 99):.2f} ms")
-    print(f"  sync_gap mean  : {mean(sync_gap_ms):.2f} ms")
-    print(f"  thermal_net    : {mean(t_net_ms):.3f} ms")
-    print(f"  imagery_net    : {mean(i_net_ms):.3f} ms")
-    print(f"  thermal_proc   : {mean(t_proc_ms):.3f} ms")
-    print(f"  imagery_proc   : {mean(i_proc_ms):.3f} ms")
-    print(f"  fusion_proc    : {mean(f_proc_ms):.3f} ms")
-    print(f"  raw fire rate  : {100*sum(raw)/max(1,len(raw)):.1f}%")
-    print(f"  decision rate  : {100*sum(decision)/max(1,len(decision)):.1f}%")
+    print(f"  events         : {np.count_nonzero(has_e2e)}")
+    print(f"  e2e mean       : {e2e_mean:.2f} ms")
+    print(f"  e2e median     : {p50:.2f} ms")
+    print(f"  e2e p95        : {p95:.2f} ms")
+    print(f"  e2e p99        : {p99:.2f} ms")
+    print(f"  sync_gap mean  : {sync_mean:.2f} ms")
+    print(f"  thermal_net    : {t_net_mean:.3f} ms")
+    print(f"  imagery_net    : {i_net_mean:.3f} ms")
+    print(f"  thermal_proc   : {t_proc_mean:.3f} ms")
+    print(f"  imagery_proc   : {i_proc_mean:.3f} ms")
+    print(f"  fusion_proc    : {f_proc_mean:.3f} ms")
+    print(f"  raw fire rate  : {100*raw.mean():.1f}%")
+    print(f"  decision rate  : {100*decision.mean():.1f}%")
+
+    if args.summary_only:
+        if "fire_window" in names:
+            print_hit_miss(hit_miss_stats(cols["fire_window"], decision), label)
+        return
+
+    # Plotting only from here on.  matplotlib is imported lazily so that
+    # --summary-only runs skip its import and backend setup entirely.
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    os.makedirs(args.outdir, exist_ok=True)
+
+    # Long runs produce tens of thousands of points: let Agg simplify/chunk
+    # dense paths instead of stroking every vertex.
+    matplotlib.rcParams.update({
+        "path.simplify": True,
+        "path.simplify_threshold": 1.0,
+        "agg.path.chunksize": 10000,
+    })
 
     # --- 1. Pie chart — now includes sync gap ---
     parts = {
-        "Sync gap\n(stream misalignment)": mean(sync_gap_ms),
-        "Thermal net": mean(t_net_ms),
-        "Imagery net": mean(i_net_ms),
-        "Thermal proc": mean(t_proc_ms),
-        "Imagery proc": mean(i_proc_ms),
-        "Fusion proc": mean(f_proc_ms),
+        "Sync gap\n(stream misalignment)": sync_mean,
+        "Thermal net": t_net_mean,
+        "Imagery net": i_net_mean,
+        "Thermal proc": t_proc_mean,
+        "Imagery proc": i_proc_mean,
+        "Fusion proc": f_proc_mean,
     }
     labels = list(parts.keys())
     values = list(parts.values())
 
-    # Labels include absolute ms so numbers can be compared with Orin / Alice's setup
-    abs_labels = [f"{l}\n{v:.1f} ms" for l, v in zip(labels, values)]
+    # Labels include absolute ms so numbers can be compared with Orin / Alice's setup.
+    # Percentages are formatted up front rather than via an autopct callback.
+    total = sum(values)
+    abs_labels = [f"{l}\n{v:.1f} ms ({100*v/total if total else 0.0:.1f}%)"
+                  for l, v in zip(labels, values)]
     plt.figure(figsize=(8, 8))
-    plt.pie(values, labels=abs_labels, autopct="%1.1f%%", startangle=140)
+    plt.pie(values, labels=abs_labels, startangle=140)
     plt.title(
         f"Mean E2E Latency Contribution{label}\n"
-        f"(mean E2E = {mean(e2e_ms):.1f} ms  |  total components = {sum(values):.1f} ms)"
+        f"(mean E2E = {e2e_mean:.1f} ms  |  total components = {total:.1f} ms)"
     )
     pie_path = os.path.join(args.outdir, "latency_contribution_pie.png")
-    plt.savefig(pie_path, dpi=200, bbox_inches="tight")
+    plt.savefig(pie_path, dpi=DPI, bbox_inches="tight")
     plt.close()
     print(f"Wrote {pie_path}")
 
     # --- 2. E2E latency time series with stacked components ---
     fig, axes = plt.subplots(2, 1, figsize=(12, 7), sharex=True)
 
-    x = list(range(len(e2e_ms)))
-    axes[0].plot(x, e2e_ms, color="steelblue", alpha=0.8, linewidth=0.8, label="E2E (ms)")
+    # Only events with an e2e_ms are plotted (as the event count above)
+    x = np.arange(np.count_nonzero(has_e2e))
+    (e2e_line,) = axes[0].plot(x, e2e_ms[has_e2e], color="steelblue", alpha=0.8, linewidth=0.8, label="E2E (ms)")
+    e2e_line.set_rasterized(True)
     axes[0].set_ylabel("E2E latency (ms)")
     axes[0].set_title(f"End-to-End Latency Over Time{label}")
     axes[0].legend()
@@ -130,9 +272,9 @@ def main() -> None:
     # Stacked area: sync gap vs network vs proc
     axes[1].stackplot(
         x,
-        sync_gap_ms,
-        [tn + in_ for tn, in_ in zip(t_net_ms, i_net_ms)],
-        [tp + ip + fp for tp, ip, fp in zip(t_proc_ms, i_proc_ms, f_proc_ms)],
+        sync_gap_ms[has_e2e],
+        net_ms[has_e2e],
+        proc_ms[has_e2e],
         labels=["Sync gap", "Network (both streams)", "Processing (both + fusion)"],
         alpha=0.7,
     )
@@ -143,26 +285,27 @@ def main() -> None:
 
     plt.tight_layout()
     ts_path = os.path.join(args.outdir, "e2e_latency_timeseries.png")
-    plt.savefig(ts_path, dpi=200, bbox_inches="tight")
+    plt.savefig(ts_path, dpi=DPI, bbox_inches="tight")
     plt.close()
     print(f"Wrote {ts_path}")
 
     # --- 3. Phase 4: Rolling window ---
-    if rows and "raw_signal" in rows[0]:
-        raw_int   = [1 if r.get("raw_signal") else 0 for r in rows]
-        dec_int   = [1 if r.get("decision") else 0 for r in rows]
-        confirms  = [r.get("window_confirmations", 0) for r in rows]
-        confirm_k = rows[0].get("fire_confirm_k", 3)
+    if "raw_signal" in names:
+        raw_int   = raw.astype(int)
+        dec_int   = decision.astype(int)
+        confirms  = col("window_confirmations", np.zeros(n, dtype=int))
+        confirm_k = int(cols["fire_confirm_k"][0]) if "fire_confirm_k" in names else 3
 
+        idx = np.arange(n)  # every fusion event, with or without e2e_ms
         fig, axes = plt.subplots(2, 1, figsize=(12, 6), sharex=True)
-        axes[0].plot(x, raw_int,  label="raw_signal", alpha=0.8, drawstyle="steps-post")
-        axes[0].plot(x, dec_int,  label="decision",   alpha=0.8, drawstyle="steps-post")
+        axes[0].plot(idx, raw_int,  label="raw_signal", alpha=0.8, drawstyle="steps-post")
+        axes[0].plot(idx, dec_int,  label="decision",   alpha=0.8, drawstyle="steps-post")
         axes[0].set_ylabel("Signal (0/1)")
         axes[0].set_title(f"Phase 4: Raw Signal vs Rolling Window Decision{label}")
         axes[0].legend(loc="upper right")
         axes[0].set_ylim(-0.1, 1.2)
 
-        axes[1].bar(x, confirms, alpha=0.7, label="confirmations in window")
+        axes[1].bar(idx, confirms, alpha=0.7, label="confirmations in window")
         axes[1].axhline(y=confirm_k, color="r", linestyle="--", label=f"threshold={confirm_k}")
         axes[1].set_xlabel("Fusion event index")
         axes[1].set_ylabel("Confirmations")
@@ -170,79 +313,62 @@ def main() -> None:
 
         plt.tight_layout()
         phase4_path = os.path.join(args.outdir, "phase4_rolling_window.png")
-        plt.savefig(phase4_path, dpi=200, bbox_inches="tight")
+        plt.savefig(phase4_path, dpi=DPI, bbox_inches="tight")
         plt.close()
         print(f"Wrote {phase4_path}")
 
-    # --- 4. Phase 5: Drone distance over time ---
-    t_dist_all = [r.get("thermal_distance_m") for r in rows]
-    i_dist_all = [r.get("imagery_distance_m") for r in rows]
-    t_dist = [d for d in t_dist_all if d is not None]
-    i_dist = [d for d in i_dist_all if d is not None]
-
-    if t_dist or i_dist:
-        plt.figure(figsize=(10, 4))
-        if t_dist:
-            plt.plot(t_dist, label="thermal drone", alpha=0.8)
-        if i_dist:
-            plt.plot(i_dist, label="imagery drone", alpha=0.8)
-        plt.xlabel("Fusion event index")
-        plt.ylabel("Distance to controller (m)")
-        plt.title(f"Phase 5: Drone Distance Over Time{label}")
-        plt.legend()
-        d_path = os.path.join(args.outdir, "phase5_drone_distance.png")
-        plt.savefig(d_path, dpi=200, bbox_inches="tight")
-        plt.close()
-        print(f"Wrote {d_path}")
-
-    # --- 5. Phase 5: E2E vs distance scatter ---
-    valid = [
-        (e, td, id_)
-        for e, td, id_ in zip(e2e_ms, t_dist_all, i_dist_all)
-        if td is not None or id_ is not None
-    ]
-    if valid:
-        e_v  = [v[0] for v in valid]
-        td_v = [v[1] if v[1] is not None else 0 for v in valid]
-        id_v = [v[2] if v[2] is not None else 0 for v in valid]
-
-        plt.figure(figsize=(8, 5))
-        plt.scatter(td_v, e_v, alpha=0.5, label="thermal drone", s=20)
-        plt.scatter(id_v, e_v, alpha=0.5, label="imagery drone",  s=20)
-        plt.xlabel("Drone distance (m)")
-        plt.ylabel("E2E latency (ms)")
-        plt.title(f"Phase 5: E2E Latency vs Drone Distance{label}")
-        plt.legend()
-        sc_path = os.path.join(args.outdir, "phase5_e2e_vs_distance.png")
-        plt.savefig(sc_path, dpi=200, bbox_inches="tight")
-        plt.close()
-        print(f"Wrote {sc_path}")
+    # --- 4./5. Phase 5: drone distance plots ---
+    # Pre-Phase-5 logs carry no distance fields: skip the section outright.
+    has_dist = "thermal_distance_m" in names or "imagery_distance_m" in names
+    if has_dist:
+        # 4. Drone distance over time
+        no_dist = np.full(n, np.nan)
+        t_dist_all = col("thermal_distance_m", no_dist)
+        i_dist_all = col("imagery_distance_m", no_dist)
+        t_dist = t_dist_all[~np.isnan(t_dist_all)]
+        i_dist = i_dist_all[~np.isnan(i_dist_all)]
+
+        if t_dist.size or i_dist.size:
+            plt.figure(figsize=(10, 4))
+            if t_dist.size:
+                plt.plot(t_dist, label="thermal drone", alpha=0.8)
+            if i_dist.size:
+                plt.plot(i_dist, label="imagery drone", alpha=0.8)
+            plt.xlabel("Fusion event index")
+            plt.ylabel("Distance to controller (m)")
+            plt.title(f"Phase 5: Drone Distance Over Time{label}")
+            plt.legend()
+            d_path = os.path.join(args.outdir, "phase5_drone_distance.png")
+            plt.savefig(d_path, dpi=DPI, bbox_inches="tight")
+            plt.close()
+            print(f"Wrote {d_path}")
+
+        # 5. E2E vs distance scatter
+        valid = has_e2e & (~np.isnan(t_dist_all) | ~np.isnan(i_dist_all))
+        if valid.any():
+            e_v  = e2e_ms[valid]
+            td_v = np.nan_to_num(t_dist_all[valid])
+            id_v = np.nan_to_num(i_dist_all[valid])
+
+            plt.figure(figsize=(8, 5))
+            plt.scatter(td_v, e_v, alpha=0.5, label="thermal drone", s=20, rasterized=True)
+            plt.scatter(id_v, e_v, alpha=0.5, label="imagery drone",  s=20, rasterized=True)
+            plt.xlabel("Drone distance (m)")
+            plt.ylabel("E2E latency (ms)")
+            plt.title(f"Phase 5: E2E Latency vs Drone Distance{label}")
+            plt.legend()
+            sc_path = os.path.join(args.outdir, "phase5_e2e_vs_distance.png")
+            plt.savefig(sc_path, dpi=DPI, bbox_inches="tight")
+            plt.close()
+            print(f"Wrote {sc_path}")
 
     # --- 6. Fire window hit / miss / false-alarm table -------------------------
     # Only generated when fire_window ground-truth is present in the log.
-    if rows and "fire_window" in rows[0]:
-        fw   = [bool(r.get("fire_window", False)) for r in rows]
-        dec  = [bool(r.get("decision", False))    for r in rows]
-
-        TP = sum(1 for f, d in zip(fw, dec) if     f and     d)
-        FN = sum(1 for f, d in zip(fw, dec) if     f and not d)
-        FP = sum(1 for f, d in zip(fw, dec) if not f and     d)
-        TN = sum(1 for f, d in zip(fw, dec) if not f and not d)
-
-        total_fire    = TP + FN
-        total_no_fire = TN + FP
-        recall        = TP / total_fire    if total_fire    > 0 else float("nan")
-        precision     = TP / (TP + FP)    if (TP + FP)     > 0 else float("nan")
-        fpr           = FP / total_no_fire if total_no_fire > 0 else float("nan")
-        miss_rate     = FN / total_fire    if total_fire    > 0 else float("nan")
-
-        print(f"\nFire Window Hit/Miss{label}:")
-        print(f"  Fire events (TP+FN)  : {total_fire}")
-        print(f"  Hits (TP)            : {TP}   ({100*recall:.1f}% recall / hit-rate)")
-        print(f"  Misses (FN)          : {FN}   ({100*miss_rate:.1f}% miss-rate)")
-        print(f"  False alarms (FP)    : {FP}   ({100*fpr:.1f}% false-alarm rate)")
-        print(f"  True quiet (TN)      : {TN}")
-        print(f"  Precision            : {100*precision:.1f}%")
+    if "fire_window" in names:
+        stats = hit_miss_stats(cols["fire_window"], decision)
+        print_hit_miss(stats, label)
+        TP, FN, FP, TN, recall, precision, fpr, miss_rate = stats
+        total_fire = TP + FN
 
         # Save as a PNG table
         fig, ax = plt.subplots(figsize=(9, 4))
@@ -297,7 +423,7 @@ def main() -> None:
         )
         plt.tight_layout()
         hm_path = os.path.join(args.outdir, "fire_hit_miss_table.png")
-        plt.savefig(hm_path, dpi=200, bbox_inches="tight")
+        plt.savefig(hm_path, dpi=DPI, bbox_inches="tight")
         plt.close()
         print(f"Wrote {hm_path}")
 
@@ -3,18 +3,20 @@ Cross-run comparison plots for slides.
 
 Usage:
   python3 compare_runs.py --outdir results/comparison
+  python3 compare_runs.py --summary-only   # table only, no matplotlib
 """
 
 from __future__ import annotations
 import argparse
 import json
 import os
-from typing import Dict, List, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
 import numpy as np
 
+from analyze_latency import load_columns, ns_to_ms, summarize_components
+
 
 RUNS = {
     "Baseline\n(no stress)":      "results/baseline/latency_log.jsonl",
@@ -32,61 +34,148 @@ COLORS = {
 
 PALETTE = ["#4c72b0", "#dd8452", "#55a868", "#c44e52"]
 
+DPI = 150  # output resolution, same as the other analysis scripts
+
+# extract() results are cached next to each log as <log>.summary.json.
+# Bump SUMMARY_VERSION whenever extract() or load_columns() changes what a
+# summary contains, so stale caches are recomputed rather than served.
+SUMMARY_SUFFIX = ".summary.json"
+SUMMARY_VERSION = 4
+
+
+def extract(cols: np.ndarray) -> Dict[str, Any]:
+    """
+    Summary stats for one run from the load_columns() structured array.
+    Columns an older log lacks count as 0 ms / False, as LOG_FIELDS fills
+    them per record; a log without e2e_ms gives NaN latency stats.
+    """
+    n     = len(cols)
+    names = cols.dtype.names
+
+    def ms(key: str) -> np.ndarray:
+        return ns_to_ms(cols[key]) if key in names else np.zeros(n, dtype=np.float32)
+
+    def flag(key: str) -> np.ndarray:
+        return cols[key] if key in names else np.zeros(n, dtype=bool)
+
+    e2e    = cols["e2e_ms"] if "e2e_ms" in names else np.full(n, np.nan)
+    t_net  = ms("thermal_net_ns")
+    i_net  = ms("imagery_net_ns")
+    t_proc = ms("thermal_proc_ns")
+    i_proc = ms("imagery_proc_ns")
+    f_proc = ms("fusion_proc_ns")
+    net, proc, sync = summarize_components(t_proc, i_proc, t_net, i_net, f_proc, e2e)
+    raw    = flag("raw_signal")
+    dec    = flag("decision")
+    p50, p95, p99 = np.nanpercentile(e2e, [50, 95, 99], method="nearest")
+    e2e_mean, sync_mean, net_mean, t_net_mean, i_net_mean, proc_mean = (
+        np.nanmean(np.column_stack((e2e, sync, net, t_net, i_net, proc)), axis=0).tolist())
+    return dict(
+        n          = int(np.count_nonzero(~np.isnan(e2e))),
+        e2e_mean   = e2e_mean,
+        e2e_p50    = float(p50),
+        e2e_p95    = float(p95),
+        e2e_p99    = float(p99),
+        sync_mean  = sync_mean,
+        net_mean   = net_mean,
+        t_net_mean = t_net_mean,
+        i_net_mean = i_net_mean,
+        proc_mean  = proc_mean,
+        raw_pct    = float(raw.mean()) * 100.0,
+        dec_pct    = float(dec.mean()) * 100.0,
+    )
 
-def load(path: str) -> List[Dict[str, Any]]:
-    with open(path, encoding="utf-8") as f:
-        return [json.loads(l) for l in f if l.strip()]
 
+def _summary_stamp(path: str) -> list:
+    st = os.stat(path)
+    return [SUMMARY_VERSION, st.st_mtime_ns, st.st_size]
 
-def percentile(xs, p):
-    xs = sorted(xs)
-    k = int(round(p / 100 * (len(xs) - 1)))
-    return xs[max(0, min(k, len(xs) - 1))]
 
+def load_cached_summary(path: str, stamp: list) -> Optional[Dict[str, Any]]:
+    """The summary cached for path under stamp, or None if absent or stale."""
+    try:
+        with open(path + SUMMARY_SUFFIX, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached["stamp"] == stamp:
+            return cached["summary"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
 
-def mean(xs):
-    return sum(xs) / max(1, len(xs))
 
+def cached_extract(path: str) -> Dict[str, Any]:
+    """
+    extract(load_columns(path)), memoised in <path>.summary.json.
 
-def extract(rows):
-    e2e   = [r["e2e_ms"] for r in rows]
-    t_net = [r.get("thermal_net_ns", 0) / 1e6 for r in rows]
-    i_net = [r.get("imagery_net_ns", 0) / 1e6 for r in rows]
-    t_proc= [r.get("thermal_proc_ns", 0) / 1e6 for r in rows]
-    i_proc= [r.get("imagery_proc_ns", 0) / 1e6 for r in rows]
-    f_proc= [r.get("fusion_proc_ns", 0) / 1e6 for r in rows]
-    meas  = [a+b+c+d+e for a,b,c,d,e in zip(t_net, i_net, t_proc, i_proc, f_proc)]
-    sync  = [max(0.0, x - m) for x, m in zip(e2e, meas)]
-    raw   = [r.get("raw_signal", False) for r in rows]
-    dec   = [r.get("decision", False) for r in rows]
-    return dict(
-        n          = len(e2e),
-        e2e_mean   = mean(e2e),
-        e2e_p50    = percentile(e2e, 50),
-        e2e_p95    = percentile(e2e, 95),
-        e2e_p99    = percentile(e2e, 99),
-        sync_mean  = mean(sync),
-        net_mean   = mean([a+b for a,b in zip(t_net, i_net)]),
-        t_net_mean = mean(t_net),
-        i_net_mean = mean(i_net),
-        proc_mean  = mean([a+b+c for a,b,c in zip(t_proc, i_proc, f_proc)]),
-        raw_pct    = 100 * sum(raw) / max(1, len(raw)),
-        dec_pct    = 100 * sum(dec) / max(1, len(dec)),
-    )
+    The cache is keyed on SUMMARY_VERSION and the log's mtime and size, so
+    re-running only re-parses logs that changed since the last invocation.
+    """
+    stamp = _summary_stamp(path)
+    summary = load_cached_summary(path, stamp)
+    if summary is not None:
+        return summary
+
+    summary = extract(load_columns(path))
+    try:
+        with open(path + SUMMARY_SUFFIX, "w", encoding="utf-8") as f:
+            json.dump({"stamp": stamp, "summary": summary}, f)
+    except OSError:
+        pass  # read-only results dir — still return the fresh summary
+    return summary
 
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--outdir", default="results/comparison")
+    ap.add_argument("--summary-only", action="store_true",
+                    help="Print the per-run summary table and exit without plotting")
     args = ap.parse_args()
-    os.makedirs(args.outdir, exist_ok=True)
 
-    data = {}
+    present = {}
     for label, path in RUNS.items():
         if not os.path.exists(path):
             print(f"Missing: {path} — skipping {label.strip()}")
             continue
-        data[label] = extract(load(path))
+        present[label] = path
+
+    summaries = {}
+    stale = {}
+    for label, path in present.items():
+        summary = load_cached_summary(path, _summary_stamp(path))
+        if summary is None:
+            stale[label] = path
+        else:
+            summaries[label] = summary
+
+    # Runs are independent and parse-bound: summarise the uncached ones on
+    # separate cores. Only the small summary dict crosses back from each
+    # worker process; a single log is not worth starting a pool for.
+    if len(stale) > 1:
+        with ProcessPoolExecutor(max_workers=len(stale)) as ex:
+            futures = {label: ex.submit(cached_extract, path) for label, path in stale.items()}
+            summaries.update((label, f.result()) for label, f in futures.items())
+    else:
+        summaries.update((label, cached_extract(path)) for label, path in stale.items())
+    data = {label: summaries[label] for label in present}  # keep RUNS order
+
+    if args.summary_only:
+        print(f"{'Run':<28} {'n':>6} {'e2e mean':>9} {'p50':>8} {'p95':>9} {'p99':>9}"
+              f" {'sync':>9} {'net':>7} {'proc':>7} {'raw %':>6} {'dec %':>6}")
+        for label, d in data.items():
+            print(f"{label.replace(chr(10), ' '):<28} {d['n']:>6} {d['e2e_mean']:>9.2f}"
+                  f" {d['e2e_p50']:>8.2f} {d['e2e_p95']:>9.2f} {d['e2e_p99']:>9.2f}"
+                  f" {d['sync_mean']:>9.2f} {d['net_mean']:>7.3f} {d['proc_mean']:>7.3f}"
+                  f" {d['raw_pct']:>6.1f} {d['dec_pct']:>6.1f}")
+        return
+
+    # Plotting only from here on: matplotlib is imported lazily so that
+    # --summary-only runs skip its import and backend setup entirely.
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as mpatches
+
+    os.makedirs(args.outdir, exist_ok=True)
 
     labels  = list(data.keys())
     short   = [l.replace("\n", " ") for l in labels]
@@ -116,7 +205,7 @@ def main():
         ax.text(i,     p5 + 8, f"{p5:.0f}", ha="center", fontsize=8)
         ax.text(i + w, p9 + 8, f"{p9:.0f}", ha="center", fontsize=8)
     plt.tight_layout()
-    plt.savefig(os.path.join(args.outdir, "e2e_comparison.png"), dpi=200, bbox_inches="tight")
+    plt.savefig(os.path.join(args.outdir, "e2e_comparison.png"), dpi=DPI, bbox_inches="tight")
     plt.close()
     print("Wrote e2e_comparison.png")
 
@@ -142,7 +231,7 @@ def main():
         total = s + n + p
         ax.text(i, total + 5, f"{total:.0f}ms", ha="center", fontsize=9, fontweight="bold")
     plt.tight_layout()
-    plt.savefig(os.path.join(args.outdir, "latency_breakdown_stacked.png"), dpi=200, bbox_inches="tight")
+    plt.savefig(os.path.join(args.outdir, "latency_breakdown_stacked.png"), dpi=DPI, bbox_inches="tight")
     plt.close()
     print("Wrote latency_breakdown_stacked.png")
 
@@ -163,7 +252,7 @@ def main():
         ax.text(i - 0.2, t + 1, f"{t:.1f}", ha="center", fontsize=9)
         ax.text(i + 0.2, im + 1, f"{im:.1f}", ha="center", fontsize=9)
     plt.tight_layout()
-    plt.savefig(os.path.join(args.outdir, "network_delay_per_stream.png"), dpi=200, bbox_inches="tight")
+    plt.savefig(os.path.join(args.outdir, "network_delay_per_stream.png"), dpi=DPI, bbox_inches="tight")
     plt.close()
     print("Wrote network_delay_per_stream.png")
 
@@ -184,7 +273,7 @@ def main():
         ax.text(i - 0.2, r + 0.2, f"{r:.1f}%", ha="center", fontsize=9)
         ax.text(i + 0.2, d + 0.2, f"{d:.1f}%", ha="center", fontsize=9)
     plt.tight_layout()
-    plt.savefig(os.path.join(args.outdir, "detection_rate_comparison.png"), dpi=200, bbox_inches="tight")
+    plt.savefig(os.path.join(args.outdir, "detection_rate_comparison.png"), dpi=DPI, bbox_inches="tight")
     plt.close()
     print("Wrote detection_rate_comparison.png")
 
@@ -231,7 +320,7 @@ def main():
 
     plt.title("Phase 6 Experiment Summary", fontsize=13, fontweight="bold", pad=12)
     plt.tight_layout()
-    plt.savefig(os.path.join(args.outdir, "summary_table.png"), dpi=200, bbox_inches="tight")
+    plt.savefig(os.path.join(args.outdir, "summary_table.png"), dpi=DPI, bbox_inches="tight")
     plt.close()
     print("Wrote summary_table.png")
 
@@ -253,7 +342,7 @@ def main():
     ax.yaxis.grid(True, alpha=0.4)
     ax.set_axisbelow(True)
     plt.tight_layout()
-    plt.savefig(os.path.join(args.outdir, "e2e_vs_components_line.png"), dpi=200, bbox_inches="tight")
+    plt.savefig(os.path.join(args.outdir, "e2e_vs_components_line.png"), dpi=DPI, bbox_inches="tight")
     plt.close()
     print("Wrote e2e_vs_components_line.png")
 
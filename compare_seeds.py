@@ -56,7 +56,7 @@ def load(seed, exp_name):
     p = SEED_DIRS[seed] / exp_name / "latency_log.jsonl"
     if not p.exists():
         return pd.DataFrame()
-    rows = [json.loads(l) for l in p.read_text().splitlines() if l.strip()]
+    rows = [json.loads(l) for l in p.read_bytes().splitlines() if l]
     return pd.DataFrame(rows)
 
 def hit_miss_stats(df):
@@ -15,22 +15,62 @@ Listens on TCP 5001 (thermal) and TCP 5002 (imagery).
 from __future__ import annotations
 
 import argparse
+import atexit
+import base64
 import csv
+import functools
 import json
+import logging
+import logging.handlers
 import os
+import queue
+import selectors
+import signal
 import socket
 import sys
 import threading
 import time
+from array import array
+from bisect import bisect_left
 from collections import deque
 from typing import Any, Dict, Optional, Tuple
 
 from gps_time import utc_iso, utc_ns
 
+# Optional: orjson parses/serialises several times faster than stdlib json.
+# Either way records are produced as newline-terminated bytes.
+try:
+    import orjson
+
+    json_loads = orjson.loads
+
+    def json_line(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    json_loads = json.loads
+    # Built once: compact separators, and no per-call encoder construction or
+    # circular-reference bookkeeping (records are flat dicts).
+    _json_encode = json.JSONEncoder(separators=(",", ":"), check_circular=False).encode
+
+    def json_line(obj: Any) -> bytes:
+        return (_json_encode(obj) + "\n").encode()
+
+# Optional: numpy reduces large float32 thermal grids in one vectorised call.
+# Below NUMPY_MAX_MIN_CELLS the call overhead loses to array('f') + max().
+try:
+    import numpy as np
+except ImportError:
+    np = None
+NUMPY_MAX_MIN_CELLS = 64
+
 THERMAL_PORT = 5001
 IMAGERY_PORT = 5002
 HOST = "0.0.0.0"
 
+# Socket tuning: one recv() should pull in a whole burst of messages
+RECV_CHUNK_BYTES = 1 << 16
+SO_RCVBUF_BYTES = 1 << 20
+
 # Phase 1 fusion constants
 TEMP_THRESHOLD = 100.0
 # With GPS clock-snap workers send within ~5 ms of each other, so matched pairs
@@ -64,9 +104,27 @@ SYNC_THRESHOLD_MS: float = 5.0  # overridden by --sync-threshold-ms
 LATENCY_LOG_JSONL = "latency_log.jsonl"
 FUSION_LOG_CSV = "fusion_log.csv"
 
+# Both logs stay open for the whole run.  Fusion records are queued in memory
+# and written + flushed as one batch every LOG_FLUSH_EVERY records or
+# LOG_FLUSH_INTERVAL_S seconds, whichever first.
+LOG_FLUSH_EVERY: int = 16
+LOG_FLUSH_INTERVAL_S: float = 1.0
+
+# Per-fusion [FUSION] lines are DEBUG (shown with --verbose): otherwise
+# fusion_log.debug() returns before building a record. When shown they go
+# through a QueueHandler (wired up in main): the fusion thread still formats
+# the line, but the stdout write happens on a listener thread, so a slow
+# terminal never blocks fusion.
+fusion_log = logging.getLogger("fusion")
+
 # --- Shared state (thread-safe with lock) ---
 lock = threading.Lock()
 
+# The network reactor only parses and enqueues ("thermal" | "imagery", msg,
+# rx_ns); a single fusion thread drains this queue, so reads never wait on
+# fusion work (CSV/JSONL writes, prints).
+fusion_q: queue.SimpleQueue = queue.SimpleQueue()
+
 # Phase 6: per-stream message buffers (replaces last_thermal / last_imagery)
 thermal_buffer: deque = deque(maxlen=SYNC_BUFFER_SIZE)
 imagery_buffer: deque = deque(maxlen=SYNC_BUFFER_SIZE)
@@ -75,13 +133,28 @@ imagery_buffer: deque = deque(maxlen=SYNC_BUFFER_SIZE)
 # buffer rotates and the same semantic pair reappears with a different entry.
 fused_pairs: deque = deque(maxlen=20)   # stores (thermal_tx_ns, imagery_tx_ns)
 
-# Phase 2: rolling-window packet arrival timestamps (seconds)
-thermal_arrivals: deque = deque()
-imagery_arrivals: deque = deque()
-
-# Phase 2: first-seen timestamps (seconds) to avoid "startup false drop"
-first_thermal_seen_s: Optional[float] = None
-first_imagery_seen_s: Optional[float] = None
+# (thermal, imagery) tx_ns of the newest buffered message of each stream at the
+# last try_evaluate; if neither has advanced there is nothing new to match.
+# None until the first evaluation (a missing tx_ns also reads as 0).
+last_eval_tails: Optional[Tuple[int, int]] = None
+
+# Phase 2: rolling-window packet arrival timestamps (rx_ns integers).
+# Fixed-capacity rings: appending is the only per-packet work and the oldest
+# entries fall off by themselves; the monitor counts the window by binary
+# search.  Not under `lock`: only the fusion thread appends and the monitor
+# only copies, both atomic in CPython.
+# Sized for one MONITOR_WINDOW_S at ARRIVAL_RING_HEADROOM times the
+# faster expected stream rate, so bursts still fit without undercounting.
+ARRIVAL_RING_HEADROOM: int = 4
+ARRIVAL_RING_SIZE: int = int(
+    max(EXPECTED_THERMAL_HZ, EXPECTED_IMAGERY_HZ) * MONITOR_WINDOW_S * ARRIVAL_RING_HEADROOM
+)
+thermal_arrivals: deque = deque(maxlen=ARRIVAL_RING_SIZE)
+imagery_arrivals: deque = deque(maxlen=ARRIVAL_RING_SIZE)
+
+# Phase 2: first-seen timestamps (UTC ns) to avoid "startup false drop"
+first_thermal_seen_ns: Optional[int] = None
+first_imagery_seen_ns: Optional[int] = None
 
 # Phase 2: server health (bind success)
 thermal_server_up = False
@@ -93,20 +166,37 @@ fusion_id = 0
 # Phase 4: sliding window of per-event raw fire signals
 fire_signal_window: deque = deque(maxlen=FIRE_WINDOW_K)
 
-# CSV file handle (opened at startup)
+# CSV + JSONL file handles (opened at startup)
 logfile = None
 csv_writer = None
+latency_fp = None
+
+# Records not yet written (CSV rows / encoded JSONL lines), and when the
+# last batch was written
+csv_pending: list = []
+jsonl_pending: list = []
+last_flush_s = 0.0
 
 
 def clamp01(x: float) -> float:
     return 0.0 if x < 0.0 else 1.0 if x > 1.0 else x
 
 
-def prune_old(arrivals: deque, now_s: float, window_s: float) -> None:
-    """Remove timestamps older than window_s from arrivals deque."""
-    cutoff = now_s - window_s
-    while arrivals and arrivals[0] < cutoff:
-        arrivals.popleft()
+def count_recent(arrivals: deque, now_ns: int, window_ns: int) -> int:
+    """Number of timestamps in the sorted arrivals ring within window_ns of now_ns."""
+    # One C-level copy (the fusion thread keeps appending), then a binary
+    # search for the cutoff instead of popping expired entries one by one;
+    # the ring's maxlen already bounds memory, so nothing needs removing.
+    snap = list(arrivals)
+    return len(snap) - bisect_left(snap, now_ns - window_ns)
+
+
+# Shape strings keyed by (rows, cols) for grids or (len,) for 1D lists. The
+# key comes off the wire, so the cache is bounded: a deployment only sees a
+# handful of shapes, and a peer cycling through odd ones just evicts entries.
+@functools.lru_cache(maxsize=32)
+def _shape_str(key: Tuple[int, ...]) -> str:
+    return f"{key[0]}x{key[1]}" if len(key) == 2 else f"1d:{key[0]}"
 
 
 def safe_max_temp(thermal_data: Any) -> Tuple[float, str]:
@@ -116,74 +206,197 @@ def safe_max_temp(thermal_data: Any) -> Tuple[float, str]:
     if isinstance(thermal_data, list) and thermal_data and isinstance(thermal_data[0], list):
         r = len(thermal_data)
         c = len(thermal_data[0]) if r > 0 else 0
-        m = max(max(row) for row in thermal_data if row)
-        return float(m), f"{r}x{c}"
+        # Grids are at most a few cells wide: a builtin map/filter reduction
+        # stays in C and beats converting to an array for a vectorised max.
+        m = max(map(max, filter(None, thermal_data)))
+        return float(m), _shape_str((r, c))
     if isinstance(thermal_data, list):
         m = max(thermal_data) if thermal_data else float("-inf")
-        return float(m), f"1d:{len(thermal_data)}"
+        return float(m), _shape_str((len(thermal_data),))
     return float("-inf"), "unknown"
 
 
-def imagery_has_fire(dets: Any) -> bool:
-    if not dets or not isinstance(dets, list):
-        return False
-    for d in dets:
-        if isinstance(d, dict) and d.get("label") == "fire":
-            return True
-    return False
+def thermal_max_temp(t: Dict[str, Any]) -> Tuple[float, str]:
+    """
+    Max temp + shape string for a thermal message.
+
+    Workers send the grid as base64 little-endian float32 (`data_b64`) with the
+    layout in `shape`; decoding is one C-level copy instead of a boxed float
+    per cell. Messages carrying the older nested-list `data` still work.
+    """
+    b64 = t.get("data_b64")
+    if b64 is None:
+        return safe_max_temp(t.get("data"))
+    try:
+        raw = base64.b64decode(b64)
+    except (TypeError, ValueError):  # binascii.Error is a ValueError
+        return float("-inf"), "unknown"
+    n, odd = divmod(len(raw), 4)
+    if odd:
+        return float("-inf"), "unknown"
+    if n == 0:
+        return float("-inf"), "none"
+    if np is not None and n >= NUMPY_MAX_MIN_CELLS:
+        m = float(np.frombuffer(raw, dtype="<f4").max())
+    else:
+        cells = array("f", raw)
+        if sys.byteorder == "big":
+            cells.byteswap()
+        m = float(max(cells))
+    shape = t.get("shape")
+    if (type(shape) is dict and shape.get("type") == "2d"
+            and type(shape.get("rows")) is int and type(shape.get("cols")) is int):
+        key: Tuple[int, ...] = (shape["rows"], shape["cols"])
+    else:
+        key = (n,)
+    return m, _shape_str(key)
 
 
-def recv_lines(conn: socket.socket, on_msg) -> None:
-    """Read newline-delimited JSON; call on_msg(msg, rx_ns) for each valid message."""
-    buf = ""
-    while True:
-        chunk = conn.recv(4096)
-        if not chunk:
-            return
-        buf += chunk.decode(errors="ignore")
-        while "\n" in buf:
-            line, buf = buf.split("\n", 1)
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                msg = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            rx_ns = utc_ns()
-            on_msg(msg, rx_ns)
+def imagery_has_fire(dets: Any) -> bool:
+    """Scan detections for a fire label (fallback when has_fire is not sent)."""
+    # A list comprehension + C-level `in` beats any() over a generator for the
+    # handful of detections per frame (no generator frame per item).
+    return type(dets) is list and "fire" in [d.get("label") for d in dets if type(d) is dict]
 
 
-def try_evaluate() -> None:
+def find_best_pair(thermal_buf, imagery_buf, threshold_ns: int):
     """
-    Phase 6: GPS-based matching.
-    Find the best (thermal, imagery) pair within SYNC_THRESHOLD_MS by tx_ns.
-    Skip if no pair within threshold, or if the best pair was already fused.
-    Must be called with lock held.
+    Phase 6: the (thermal, imagery) pair with the smallest |tx_thermal - tx_imagery|.
+    Returns (best_t, best_i, best_dt_ns), or (None, None, best_dt_ns) when no
+    pair is within threshold_ns.
     """
-    global fusion_id, fire_signal_window
-
-    if not thermal_buffer or not imagery_buffer:
-        return
-
-    threshold_ns = int(SYNC_THRESHOLD_MS * 1e6)
-
-    # Find the pair with the smallest |tx_thermal - tx_imagery|
     best_t: Optional[Dict] = None
     best_i: Optional[Dict] = None
     best_dt_ns = threshold_ns + 1  # sentinel: larger than allowed threshold
 
-    for t in thermal_buffer:
+    for t in thermal_buf:
         t_tx = int(t.get("tx_ns", 0) or 0)
-        for i_msg in imagery_buffer:
+        for i_msg in imagery_buf:
             i_tx = int(i_msg.get("tx_ns", 0) or 0)
             dt_ns = abs(t_tx - i_tx)
             if dt_ns < best_dt_ns:
                 best_dt_ns = dt_ns
                 best_t, best_i = t, i_msg
 
-    # No pair found within threshold — wait for more data
     if best_t is None or best_dt_ns > threshold_ns:
+        return None, None, best_dt_ns
+    return best_t, best_i, best_dt_ns
+
+
+def classify_hit_miss(fire_window: bool, decision: bool) -> str:
+    """
+    Hit/miss classification against ground truth:
+    TP = fire_window AND decision  (correctly detected)
+    FN = fire_window AND NOT decision  (missed)
+    FP = NOT fire_window AND decision  (false alarm)
+    TN = NOT fire_window AND NOT decision  (correctly quiet)
+    """
+    if fire_window:
+        return "TP" if decision else "FN"
+    return "FP" if decision else "TN"
+
+
+def write_pending_logs() -> None:
+    """Write all queued CSV rows and JSONL records in one go, then flush. Lock held."""
+    global last_flush_s
+    if latency_fp is None or latency_fp.closed:  # shutting down: close_logs() ran
+        csv_pending.clear()
+        jsonl_pending.clear()
+        return
+    if csv_pending:
+        csv_writer.writerows(csv_pending)
+        csv_pending.clear()
+        logfile.flush()
+    if jsonl_pending:
+        latency_fp.write(b"".join(jsonl_pending))
+        jsonl_pending.clear()
+        latency_fp.flush()
+    last_flush_s = time.monotonic()
+
+
+def flush_logs_if_due() -> None:
+    """Write the queued records once a batch is due. Lock held."""
+    if (len(jsonl_pending) >= LOG_FLUSH_EVERY
+            or time.monotonic() - last_flush_s >= LOG_FLUSH_INTERVAL_S):
+        write_pending_logs()
+
+
+def close_logs() -> None:
+    """
+    Write anything queued, then close both logs (idempotent; also run atexit).
+    Takes the lock: the fusion thread may still be appending records.
+    """
+    with lock:
+        if logfile is not None and not logfile.closed:
+            write_pending_logs()
+        for f in (logfile, latency_fp):
+            if f is not None and not f.closed:
+                f.close()
+
+
+def split_lines(buf: bytearray, on_msg) -> None:
+    """
+    Parse every complete newline-delimited JSON line in buf, calling
+    on_msg(msg, rx_ns) for each valid message; the trailing partial line
+    stays in buf for the next recv().
+    """
+    # One C-level split per recv chunk (json.loads takes bytes, so there is no
+    # decode); only the trailing partial line is kept in buf.
+    if b"\n" not in buf:  # still mid-line: don't copy the partial line
+        return
+    *lines, tail = buf.split(b"\n")
+    del buf[:len(buf) - len(tail)]
+    # Called per packet: bind the globals used in the loop once
+    loads, now_ns = json_loads, utc_ns
+    for line in lines:
+        if not line:
+            continue
+        try:
+            msg = loads(line)
+        except ValueError:  # JSONDecodeError (incl. whitespace-only) or invalid UTF-8
+            continue
+        on_msg(msg, now_ns())
+
+
+def try_evaluate(
+    _temp_threshold: float = TEMP_THRESHOLD,
+    _time_window_s: float = TIME_WINDOW_S,
+    _confirm_k: int = FIRE_CONFIRM_K,
+    _window_k: int = FIRE_WINDOW_K,
+    _utc_ns=utc_ns,
+    _perf_ns=time.perf_counter_ns,
+    _utc_iso=utc_iso,
+    _json_line=json_line,
+    _csv_append=csv_pending.append,
+    _jsonl_append=jsonl_pending.append,
+) -> None:
+    """
+    Phase 6: GPS-based matching.
+    Find the best (thermal, imagery) pair within SYNC_THRESHOLD_MS by tx_ns.
+    Skip if no pair within threshold, or if the best pair was already fused.
+    Must be called with lock held.
+
+    The underscore defaults bind fixed module constants and helpers (the
+    pending lists are only ever cleared, never rebound) once at def time so
+    the per-fusion reads are locals; never pass them. SYNC_THRESHOLD_MS is
+    set from the command line and is still read as a global.
+    """
+    global fusion_id, fire_signal_window, last_eval_tails
+
+    if not thermal_buffer or not imagery_buffer:
+        return
+
+    tails = (int(thermal_buffer[-1].get("tx_ns", 0) or 0),
+             int(imagery_buffer[-1].get("tx_ns", 0) or 0))
+    if tails == last_eval_tails:
+        return
+    last_eval_tails = tails
+
+    threshold_ns = int(SYNC_THRESHOLD_MS * 1e6)
+    best_t, best_i, _ = find_best_pair(thermal_buffer, imagery_buffer, threshold_ns)
+
+    # No pair found within threshold — wait for more data
+    if best_t is None:
         return
 
     # Don't re-fuse a pair we've already processed
@@ -195,42 +408,49 @@ def try_evaluate() -> None:
     fused_pairs.append(pair_key)
 
     try:
-        fusion_start_ns = utc_ns()
+        # fusion_proc_ns is an interval: take it from the monotonic clock so
+        # an NTP step can't skew it; wall-clock UTC is only read for the end.
+        fusion_start_mono = _perf_ns()
 
         t = best_t
         i = best_i
 
+        # _rx_ns is always set (as an int) by fusion_worker
+        thermal_rx_ns = t["_rx_ns"]
+        imagery_rx_ns = i["_rx_ns"]
+
         # Fall back to rx_ns if tx_ns is missing/zero
         if t_tx <= 0:
-            t_tx = int(t.get("_rx_ns", 0) or 0)
+            t_tx = thermal_rx_ns
         if i_tx <= 0:
-            i_tx = int(i.get("_rx_ns", 0) or 0)
+            i_tx = imagery_rx_ns
 
         dt_s = abs(t_tx - i_tx) / 1e9
 
-        max_temp, shape_str = safe_max_temp(t.get("data"))
+        max_temp, shape_str = thermal_max_temp(t)
         dets = i.get("detections", [])
-        fire = imagery_has_fire(dets)
+        # Workers send has_fire precomputed; older workers only send detections
+        has_fire = i.get("has_fire")
+        fire = imagery_has_fire(dets) if has_fire is None else bool(has_fire)
 
         # Phase 4: per-event raw signal
-        raw_signal = (max_temp > TEMP_THRESHOLD) and fire and (dt_s <= TIME_WINDOW_S)
+        raw_signal = (max_temp > _temp_threshold) and fire and (dt_s <= _time_window_s)
         fire_signal_window.append(raw_signal)
         confirmations = sum(fire_signal_window)
-        decision = confirmations >= FIRE_CONFIRM_K
+        decision = confirmations >= _confirm_k
         window_fill = len(fire_signal_window)
 
-        fusion_end_ns = utc_ns()
+        fusion_proc_ns = _perf_ns() - fusion_start_mono
+        fusion_end_ns = _utc_ns()
 
         # Phase 3: latency breakdown
         thermal_proc_ns = int(t.get("proc_ns", 0) or 0)
         imagery_proc_ns = int(i.get("proc_ns", 0) or 0)
-        thermal_rx_ns = int(t.get("_rx_ns", 0) or 0)
-        imagery_rx_ns = int(i.get("_rx_ns", 0) or 0)
 
-        thermal_net_ns = int(max(0, thermal_rx_ns - t_tx))
-        imagery_net_ns = int(max(0, imagery_rx_ns - i_tx))
-        fusion_proc_ns = int(fusion_end_ns - fusion_start_ns)
-        e2e_ns = int(fusion_end_ns - min(t_tx, i_tx))
+        # All operands are already ints: no int() re-boxing on this path
+        thermal_net_ns = max(0, thermal_rx_ns - t_tx)
+        imagery_net_ns = max(0, imagery_rx_ns - i_tx)
+        e2e_ns = fusion_end_ns - min(t_tx, i_tx)
         e2e_ms = e2e_ns / 1e6
 
         num_dets = len(dets) if isinstance(dets, list) else 0
@@ -244,27 +464,18 @@ def try_evaluate() -> None:
         # schedule so their values should agree; use thermal's as canonical.
         fire_window = bool(t.get("fire_window", False))
 
-        # Hit/miss classification against ground truth
-        # TP = fire_window AND decision  (correctly detected)
-        # FN = fire_window AND NOT decision  (missed)
-        # FP = NOT fire_window AND decision  (false alarm)
-        # TN = NOT fire_window AND NOT decision  (correctly quiet)
-        hit_miss = (
-            "TP" if fire_window and decision else
-            "FN" if fire_window and not decision else
-            "FP" if not fire_window and decision else
-            "TN"
-        )
+        hit_miss = classify_hit_miss(fire_window, decision)
 
-        print(
-            f"[FUSION] dt={dt_s:.3f}s temp={max_temp:.1f} fire={fire} "
-            f"shape={shape_str} raw={raw_signal} "
-            f"window={confirmations}/{window_fill} decision={decision} "
-            f"gt={'FIRE' if fire_window else 'none'} [{hit_miss}]"
+        fusion_log.debug(
+            "[FUSION] dt=%.3fs temp=%.1f fire=%s shape=%s raw=%s "
+            "window=%d/%d decision=%s gt=%s [%s]",
+            dt_s, max_temp, fire, shape_str, raw_signal,
+            confirmations, window_fill, decision,
+            "FIRE" if fire_window else "none", hit_miss,
         )
 
-        iso = utc_iso(fusion_end_ns)
-        csv_writer.writerow([
+        iso = _utc_iso(fusion_end_ns)
+        _csv_append([
             fusion_id, iso, f"{dt_s:.6f}", f"{max_temp:.3f}", fire,
             raw_signal, confirmations, window_fill, decision,
             shape_str, num_dets,
@@ -272,12 +483,10 @@ def try_evaluate() -> None:
             "" if imagery_dist is None else f"{imagery_dist:.1f}",
             fire_window, hit_miss,
         ])
-        logfile.flush()
 
         rec = {
             "fusion_id": fusion_id,
             "fusion_done_ns": fusion_end_ns,
-            "fusion_done_iso": iso,
             "thermal_seq": t.get("seq"),
             "imagery_seq": i.get("seq"),
             "thermal_tx_ns": t_tx,
@@ -295,8 +504,8 @@ def try_evaluate() -> None:
             "raw_signal": raw_signal,
             "window_confirmations": confirmations,
             "window_fill": window_fill,
-            "fire_window_k": FIRE_WINDOW_K,
-            "fire_confirm_k": FIRE_CONFIRM_K,
+            "fire_window_k": _window_k,
+            "fire_confirm_k": _confirm_k,
             "decision": decision,
             "thermal_shape": shape_str,
             "num_detections": num_dets,
@@ -307,8 +516,8 @@ def try_evaluate() -> None:
             "fire_window": fire_window,
             "hit_miss": hit_miss,
         }
-        with open(LATENCY_LOG_JSONL, "a", encoding="utf-8") as f:
-            f.write(json.dumps(rec) + "\n")
+        _jsonl_append(_json_line(rec))
+        flush_logs_if_due()
 
         fusion_id += 1
 
@@ -316,40 +525,48 @@ def try_evaluate() -> None:
         print(f"[FUSION] Error: {e}")
 
 
-def handle_thermal(conn: socket.socket) -> None:
-    def on_msg(msg: Dict[str, Any], rx_ns: int):
-        global first_thermal_seen_s
-        now_s = rx_ns / 1e9
-        msg["_rx_ns"] = rx_ns  # store receive time for latency calc
-        with lock:
-            if first_thermal_seen_s is None:
-                first_thermal_seen_s = now_s
-            thermal_buffer.append(msg)
-            thermal_arrivals.append(now_s)
-            prune_old(thermal_arrivals, now_s, MONITOR_WINDOW_S)
-            try_evaluate()
-
-    recv_lines(conn, on_msg)
-
-
-def handle_imagery(conn: socket.socket) -> None:
-    def on_msg(msg: Dict[str, Any], rx_ns: int):
-        global first_imagery_seen_s
-        now_s = rx_ns / 1e9
-        msg["_rx_ns"] = rx_ns
-        with lock:
-            if first_imagery_seen_s is None:
-                first_imagery_seen_s = now_s
-            imagery_buffer.append(msg)
-            imagery_arrivals.append(now_s)
-            prune_old(imagery_arrivals, now_s, MONITOR_WINDOW_S)
-            try_evaluate()
-
-    recv_lines(conn, on_msg)
-
-
-def server(port: int, handler, name: str) -> None:
-    """Phase 2: TCP server. If bind fails, continue (controller keeps running)."""
+def enqueue_for(kind: str):
+    """on_msg callback that hands dict messages of one stream to the fusion thread."""
+    put = fusion_q.put
+
+    def on_msg(msg: Any, rx_ns: int):
+        if type(msg) is dict:
+            put((kind, msg, rx_ns))
+
+    return on_msg
+
+
+def fusion_worker() -> None:
+    """Apply queued messages to the per-stream buffers in arrival order and fuse."""
+    global first_thermal_seen_ns, first_imagery_seen_ns
+    get = fusion_q.get
+    while True:
+        kind, msg, rx_ns = get()
+        # This is the only fusion thread: one malformed message must cost
+        # that message, not every fusion after it
+        try:
+            # Normalised once here, so a non-numeric tx_ns is rejected before
+            # it reaches the buffers that pair matching scans repeatedly
+            msg["tx_ns"] = int(msg.get("tx_ns", 0) or 0)
+            msg["_rx_ns"] = rx_ns  # store receive time for latency calc
+            # Arrival stats are lock-free (see thermal_arrivals)
+            if kind == "thermal":
+                if first_thermal_seen_ns is None:
+                    first_thermal_seen_ns = rx_ns
+                thermal_arrivals.append(rx_ns)
+            else:
+                if first_imagery_seen_ns is None:
+                    first_imagery_seen_ns = rx_ns
+                imagery_arrivals.append(rx_ns)
+            with lock:  # pending log batches are shared with monitoring_thread
+                (thermal_buffer if kind == "thermal" else imagery_buffer).append(msg)
+                try_evaluate()
+        except (KeyError, TypeError, ValueError, OverflowError) as e:
+            print(f"[FUSION] Error: {e}")
+
+
+def open_server(port: int, name: str) -> Optional[socket.socket]:
+    """Phase 2: TCP listener. If bind fails, return None (controller keeps running)."""
     global thermal_server_up, imagery_server_up
 
     s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -358,9 +575,10 @@ def server(port: int, handler, name: str) -> None:
     try:
         s.bind((HOST, port))
     except OSError as e:
+        s.close()
         print(f"[SERVER] {name} bind failed on {HOST}:{port}: {e}")
         print(f"[SERVER] {name} server will be DOWN, but controller will continue.")
-        return
+        return None
 
     s.listen(5)
     print(f"[SERVER] {name} listening on {HOST}:{port}")
@@ -369,28 +587,64 @@ def server(port: int, handler, name: str) -> None:
         thermal_server_up = True
     if name == "IMAGERY":
         imagery_server_up = True
+    return s
+
+
+def io_loop(servers) -> None:
+    """
+    Network reactor (main thread): accept and read every drone connection
+    through one selector instead of a thread per connection. servers is a list of
+    (listening socket, name, on_msg); connections only parse and enqueue.
+    """
+    sel = selectors.DefaultSelector()
+    for s, name, on_msg in servers:
+        s.setblocking(False)
+        # data = (name, on_msg, buf); buf is None for a listening socket
+        sel.register(s, selectors.EVENT_READ, (name, on_msg, None))
 
     while True:
-        conn, addr = s.accept()
-        print(f"[SERVER] {name} connection from {addr}")
-        threading.Thread(target=handler, args=(conn,), daemon=True).start()
+        for key, _ in sel.select():
+            sock = key.fileobj
+            name, on_msg, buf = key.data
+            if buf is None:
+                try:
+                    conn, addr = sock.accept()
+                except OSError:
+                    continue
+                print(f"[SERVER] {name} connection from {addr}")
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                conn.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SO_RCVBUF_BYTES)
+                conn.setblocking(False)
+                sel.register(conn, selectors.EVENT_READ, (name, on_msg, bytearray()))
+                continue
+            try:
+                chunk = sock.recv(RECV_CHUNK_BYTES)
+            except BlockingIOError:
+                continue
+            except OSError:
+                chunk = b""
+            if not chunk:  # peer closed (or reset): drop the partial line
+                sel.unregister(sock)
+                sock.close()
+                continue
+            buf += chunk
+            split_lines(buf, on_msg)
 
 
 def _stream_drop_stats(
     stream_name: str,
     arrivals: deque,
     expected_hz: float,
-    first_seen_s: Optional[float],
-    now_s: float,
+    first_seen_ns: Optional[int],
+    now_ns: int,
     window_s: float,
 ) -> Tuple[Optional[float], float, float]:
-    if first_seen_s is None:
+    if first_seen_ns is None:
         return None, 0.0, 0.0
-    effective_window = min(window_s, max(0.0, now_s - first_seen_s))
+    effective_window = min(window_s, max(0.0, (now_ns - first_seen_ns) / 1e9))
     if effective_window <= 0.0:
         return None, 0.0, 0.0
-    prune_old(arrivals, now_s, window_s)
-    recv_count = float(len(arrivals))
+    recv_count = float(count_recent(arrivals, now_ns, int(window_s * 1e9)))
     expected_count = expected_hz * effective_window
     if expected_count <= 0:
         return None, recv_count, expected_count
@@ -398,26 +652,34 @@ def _stream_drop_stats(
     return drop, recv_count, expected_count
 
 
-def monitoring_thread() -> None:
-    """Phase 2: Every MONITOR_WINDOW_S seconds, check drop rates."""
+def monitoring_thread(
+    _stop: float = DROP_STOP_THRESHOLD,
+    _window_s: float = MONITOR_WINDOW_S,
+) -> None:
+    """Phase 2: Every MONITOR_WINDOW_S seconds, check drop rates (constants bound as defaults)."""
     print("[MONITOR] Waiting 5s for workers to connect...")
     time.sleep(5)
 
-    start_s = time.time()
+    start_ns = utc_ns()
     while True:
-        time.sleep(MONITOR_WINDOW_S)
-        now_s = time.time()
-        up_s = now_s - start_s
-
-        with lock:
-            t_drop, t_recv, t_exp = _stream_drop_stats(
-                "thermal", thermal_arrivals, EXPECTED_THERMAL_HZ,
-                first_thermal_seen_s, now_s, MONITOR_WINDOW_S,
-            )
-            i_drop, i_recv, i_exp = _stream_drop_stats(
-                "imagery", imagery_arrivals, EXPECTED_IMAGERY_HZ,
-                first_imagery_seen_s, now_s, MONITOR_WINDOW_S,
-            )
+        time.sleep(_window_s)
+        now_ns = utc_ns()  # same clock as rx_ns in the arrival rings
+        up_s = (now_ns - start_ns) / 1e9
+
+        # Drop stats don't need the fusion lock (see thermal_arrivals)
+        t_drop, t_recv, t_exp = _stream_drop_stats(
+            "thermal", thermal_arrivals, EXPECTED_THERMAL_HZ,
+            first_thermal_seen_ns, now_ns, _window_s,
+        )
+        i_drop, i_recv, i_exp = _stream_drop_stats(
+            "imagery", imagery_arrivals, EXPECTED_IMAGERY_HZ,
+            first_imagery_seen_ns, now_ns, _window_s,
+        )
+        # Batches are otherwise only written when a fusion arrives; don't
+        # leave the last few records in memory while a stream is quiet.
+        if jsonl_pending:
+            with lock:
+                write_pending_logs()
 
         def fmt(drop: Optional[float], recv: float, exp: float) -> str:
             if drop is None:
@@ -425,24 +687,24 @@ def monitoring_thread() -> None:
             return f"{recv:.0f}/{exp:.0f} drop={drop:.0%}"
 
         print(
-            f"[MONITOR] up={up_s:.0f}s window={MONITOR_WINDOW_S:.0f}s "
+            f"[MONITOR] up={up_s:.0f}s window={_window_s:.0f}s "
             f"thermal={fmt(t_drop, t_recv, t_exp)} "
             f"imagery={fmt(i_drop, i_recv, i_exp)}"
         )
 
-        if thermal_server_up and t_drop is not None and t_drop > DROP_STOP_THRESHOLD:
-            print(f"[STOP] Thermal drop {t_drop:.0%} > {DROP_STOP_THRESHOLD:.0%}. Stopping.")
-            logfile.close()
+        if thermal_server_up and t_drop is not None and t_drop > _stop:
+            print(f"[STOP] Thermal drop {t_drop:.0%} > {_stop:.0%}. Stopping.")
+            close_logs()
             sys.exit(2)
 
-        if imagery_server_up and i_drop is not None and i_drop > DROP_STOP_THRESHOLD:
-            print(f"[STOP] Imagery drop {i_drop:.0%} > {DROP_STOP_THRESHOLD:.0%}. Stopping.")
-            logfile.close()
+        if imagery_server_up and i_drop is not None and i_drop > _stop:
+            print(f"[STOP] Imagery drop {i_drop:.0%} > {_stop:.0%}. Stopping.")
+            close_logs()
             sys.exit(2)
 
 
 def main() -> None:
-    global logfile, csv_writer, LATENCY_LOG_JSONL, FUSION_LOG_CSV, SYNC_THRESHOLD_MS
+    global logfile, csv_writer, latency_fp, LATENCY_LOG_JSONL, FUSION_LOG_CSV, SYNC_THRESHOLD_MS
 
     parser = argparse.ArgumentParser(description="Wildfire Controller")
     parser.add_argument(
@@ -457,6 +719,10 @@ def main() -> None:
             f"Default: {SYNC_THRESHOLD_MS}"
         ),
     )
+    parser.add_argument(
+        "--verbose", action="store_true",
+        help="Print a [FUSION] line for every fusion event (the logs record them either way)",
+    )
     args = parser.parse_args()
 
     SYNC_THRESHOLD_MS = args.sync_threshold_ms
@@ -479,7 +745,7 @@ def main() -> None:
     print(f"[CTRL] Phase 4 rolling window: K={FIRE_WINDOW_K}  confirm={FIRE_CONFIRM_K}")
     print(f"[CTRL] GPS sync: buffer={SYNC_BUFFER_SIZE}  threshold={SYNC_THRESHOLD_MS}ms")
 
-    logfile = open(FUSION_LOG_CSV, "w", newline="", encoding="utf-8")
+    logfile = open(FUSION_LOG_CSV, "w", newline="", encoding="utf-8", buffering=1 << 16)
     csv_writer = csv.writer(logfile)
     csv_writer.writerow([
         "fusion_id", "utc_iso", "dt_s", "max_temp", "imagery_fire",
@@ -489,18 +755,37 @@ def main() -> None:
         "fire_window", "hit_miss",
     ])
 
-    with open(LATENCY_LOG_JSONL, "w", encoding="utf-8") as f:
-        f.write("")
-
-    threading.Thread(target=server, args=(THERMAL_PORT, handle_thermal, "THERMAL"), daemon=True).start()
-    threading.Thread(target=server, args=(IMAGERY_PORT, handle_imagery, "IMAGERY"), daemon=True).start()
+    latency_fp = open(LATENCY_LOG_JSONL, "wb", buffering=1 << 20)
+
+    log_q: queue.SimpleQueue = queue.SimpleQueue()
+    stdout_handler = logging.StreamHandler(sys.stdout)
+    stdout_handler.setFormatter(logging.Formatter("%(message)s"))
+    log_listener = logging.handlers.QueueListener(log_q, stdout_handler)
+    fusion_log.addHandler(logging.handlers.QueueHandler(log_q))
+    fusion_log.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    fusion_log.propagate = False
+    log_listener.start()
+
+    # Records are buffered between flushes: make sure they reach disk on
+    # Ctrl-C, on SIGTERM (how mn_topo / the tests stop us) and at exit.
+    atexit.register(close_logs)
+    atexit.register(log_listener.stop)  # runs first: drains pending [FUSION] lines
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    servers = []
+    for port, name, kind in ((THERMAL_PORT, "THERMAL", "thermal"), (IMAGERY_PORT, "IMAGERY", "imagery")):
+        s = open_server(port, name)
+        if s is not None:
+            servers.append((s, name, enqueue_for(kind)))
     threading.Thread(target=monitoring_thread, daemon=True).start()
+    threading.Thread(target=fusion_worker, daemon=True).start()
 
+    # The network reactor runs on the main thread: it is where SIGINT/SIGTERM
+    # land, so select() is interrupted directly on shutdown.
     try:
-        while True:
-            time.sleep(1)
+        io_loop(servers)
     except KeyboardInterrupt:
-        logfile.close()
+        close_logs()
 
 
 if __name__ == "__main__":
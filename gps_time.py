@@ -18,7 +18,6 @@ Also exposes:
 from __future__ import annotations
 import math
 import time
-from datetime import datetime, timezone
 
 
 def utc_ns() -> int:
@@ -26,12 +25,23 @@ def utc_ns() -> int:
     return time.time_ns()
 
 
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last utc_iso() call; one tuple
+# so a reader on another thread never sees a second/prefix mismatch.
+_iso_cache: tuple = (-1, "")
+
+
 def utc_iso(ts_ns: int | None = None) -> str:
     """Human-readable ISO-8601 UTC timestamp (for debug/logging)."""
+    global _iso_cache
     if ts_ns is None:
         ts_ns = utc_ns()
-    dt = datetime.fromtimestamp(ts_ns / 1e9, tz=timezone.utc)
-    return dt.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    sec, rem_ns = divmod(ts_ns, 1_000_000_000)
+    cached_sec, prefix = _iso_cache
+    if sec != cached_sec:
+        # Formatted only once per second; the millisecond tail is integer math
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _iso_cache = (sec, prefix)
+    return f"{prefix}.{rem_ns // 1_000_000:03d}Z"
 
 
 def sleep_to_next_tick(period: float) -> None:
@@ -44,6 +54,11 @@ def sleep_to_next_tick(period: float) -> None:
     GPS sync threshold in the controller (SYNC_THRESHOLD_MS) meaningful.
 
     On real GPS-synchronized drones the equivalent is a PPS-triggered send.
+
+    This is already a deadline scheduler: the wait is recomputed from the
+    clock every tick, so time spent generating and sending never accumulates
+    as drift. It stays on the wall clock (not time.monotonic()) because the
+    point is for separate processes to share the same tick boundaries.
     """
     now = time.time()
     next_tick = math.ceil(now / period) * period
@@ -12,14 +12,15 @@ Sends imagery detections over TCP to controller on port 5002.
 from __future__ import annotations
 import argparse
 import socket
-import json
 import math
 import time
 import random
 import sys
+from collections import deque
 from typing import Any, Dict, List, Tuple
 
-from gps_time import utc_ns, utc_iso, sleep_to_next_tick, is_fire_window
+from gps_time import utc_ns, sleep_to_next_tick, is_fire_window
+from worker_link import json_line, send_frames
 
 # --- Network ---
 PORT = 5002
@@ -28,9 +29,13 @@ PORT = 5002
 # Overridden at runtime by --base-drop-prob; set to 0.0 for clean experiments.
 BASE_DROP_PROB = 0.0
 RECONNECT_SLEEP_S = 1.0
+MAX_PENDING_FRAMES = 4    # frames kept across a reconnect; oldest dropped first
 
 # --- Send behavior ---
 SEND_HZ = 2
+# A send that stalls longer than one tick raises instead of blocking the
+# loop; frames not yet handed to the kernel go out again after the reconnect.
+SEND_TIMEOUT_S = 1.0 / SEND_HZ
 
 # --- Phase 1 realism controls ---
 P_EMPTY = 0.20           # 20% chance no detections
@@ -51,8 +56,24 @@ DRONE_ALT_MAX_M: float = 200.0
 XY_MAX_M: float = 45.0
 
 
+# Random draws: the stdlib's randint()/uniform() are Python-level wrappers
+# (randint -> randrange -> _randbelow) around the C generator. These helpers
+# go straight to random.random(); random.seed() still makes runs reproducible.
+_random = random.random
+LABELS_NON_FIRE: Tuple[str, ...] = ("smoke", "tree", "rock")
+
+
+def _randint(lo: int, hi: int) -> int:
+    """Uniform integer in [lo, hi], like random.randint."""
+    return lo + int(_random() * (hi - lo + 1))
+
+
+def _uniform(lo: float, hi: float) -> float:
+    return lo + (hi - lo) * _random()
+
+
 def _distance_3d(a: Tuple[float, float, float], b: Tuple[float, float, float]) -> float:
-    return math.sqrt(sum((ai - bi) ** 2 for ai, bi in zip(a, b)))
+    return math.hypot(a[0] - b[0], a[1] - b[1], a[2] - b[2])
 
 
 def _drop_prob_from_distance(dist_m: float) -> float:
@@ -64,9 +85,9 @@ def _random_walk_3d(
     pos: Tuple[float, float, float],
     step_m: float,
 ) -> Tuple[float, float, float]:
-    dx = random.uniform(-step_m, step_m)
-    dy = random.uniform(-step_m, step_m)
-    dz = random.uniform(-step_m / 2, step_m / 2)
+    dx = _uniform(-step_m, step_m)
+    dy = _uniform(-step_m, step_m)
+    dz = _uniform(-step_m / 2, step_m / 2)
     x, y, z = pos[0] + dx, pos[1] + dy, pos[2] + dz
     # Clamp altitude
     z = max(DRONE_ALT_MIN_M, min(DRONE_ALT_MAX_M, z))
@@ -84,19 +105,19 @@ def _rand_box(base: Tuple[int, int, int, int] | None = None) -> Tuple[int, int,
     If base provided, generate a box near it to create overlap.
     """
     if base is None:
-        x1 = random.randint(0, 80)
-        y1 = random.randint(0, 80)
-        w = random.randint(10, 40)
-        h = random.randint(10, 40)
+        x1 = _randint(0, 80)
+        y1 = _randint(0, 80)
+        w = _randint(10, 40)
+        h = _randint(10, 40)
         return (x1, y1, x1 + w, y1 + h)
 
     bx1, by1, bx2, by2 = base
     # Jitter around base to create overlap
     jitter = 10
-    x1 = max(0, bx1 + random.randint(-jitter, jitter))
-    y1 = max(0, by1 + random.randint(-jitter, jitter))
-    w = max(5, (bx2 - bx1) + random.randint(-jitter, jitter))
-    h = max(5, (by2 - by1) + random.randint(-jitter, jitter))
+    x1 = max(0, bx1 + _randint(-jitter, jitter))
+    y1 = max(0, by1 + _randint(-jitter, jitter))
+    w = max(5, (bx2 - bx1) + _randint(-jitter, jitter))
+    h = max(5, (by2 - by1) + _randint(-jitter, jitter))
     return (x1, y1, x1 + w, y1 + h)
 
 
@@ -111,12 +132,12 @@ def gen_imagery() -> Dict[str, Any]:
     """
     in_fire = is_fire_window()
 
-    if random.random() < P_EMPTY:
+    if _random() < P_EMPTY:
         detections: List[Dict[str, Any]] = []
         shape = {"num_detections": 0}
         fire_present = False
     else:
-        n = random.randint(1, MAX_DETECTIONS)
+        n = _randint(1, MAX_DETECTIONS)
         detections = []
         base = _rand_box(None)
 
@@ -125,8 +146,11 @@ def gen_imagery() -> Dict[str, Any]:
             box = _rand_box(base if i > 0 else None)
             # During fire window: high chance of fire label; outside: low chance
             fire_p = 0.80 if in_fire else 0.05
-            label = "fire" if random.random() < fire_p else random.choice(["smoke", "tree", "rock"])
-            conf = round(random.uniform(0.4, 0.99), 3)
+            if _random() < fire_p:
+                label = "fire"
+            else:
+                label = LABELS_NON_FIRE[int(_random() * len(LABELS_NON_FIRE))]
+            conf = round(_uniform(0.4, 0.99), 3)
 
             if label == "fire":
                 fire_present = True
@@ -144,6 +168,9 @@ def gen_imagery() -> Dict[str, Any]:
         "shape": shape,
         "detections": detections,
         "fire_sim": fire_present,
+        # Explicit "any detection labelled fire" flag: the controller reads
+        # this instead of scanning the detection list on every fusion.
+        "has_fire": fire_present,
     }
 
 
@@ -152,6 +179,12 @@ def connect(host: str) -> socket.socket:
         try:
             s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             s.connect((host, PORT))
+            # Only sends are bounded: the handshake on a high-delay link can
+            # take longer than one tick
+            s.settimeout(SEND_TIMEOUT_S)
+            # One small frame per tick: send it now instead of letting Nagle
+            # hold it back waiting for the previous frame's ACK
+            s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             return s
         except OSError:
             time.sleep(RECONNECT_SLEEP_S)
@@ -191,6 +224,7 @@ def main() -> None:
     drone_pos: Tuple[float, float, float] = DRONE_START_POS
 
     sock = connect(host)
+    pending: deque = deque(maxlen=MAX_PENDING_FRAMES)
     print(f"[IMAGERY] Connected. Start pos={drone_pos}")
 
     while True:
@@ -199,7 +233,7 @@ def main() -> None:
         dist_m = _distance_3d(drone_pos, CONTROLLER_POS)
         drop_prob = _drop_prob_from_distance(dist_m)
 
-        if random.random() < drop_prob:
+        if _random() < drop_prob:
             sleep_to_next_tick(period)
             seq += 1
             continue
@@ -207,12 +241,12 @@ def main() -> None:
         proc_start_ns = utc_ns()
         msg = gen_imagery()
         proc_end_ns = utc_ns()
+        # The send follows within microseconds, so reuse this clock read
+        tx_ns = proc_end_ns
 
-        tx_ns = utc_ns()
         msg.update({
             "seq": seq,
             "tx_ns": tx_ns,
-            "tx_iso": utc_iso(tx_ns),
             "proc_ns": int(proc_end_ns - proc_start_ns),
             # Ground-truth fire label (mirrors thermal's fire_window field)
             "fire_window": is_fire_window(),
@@ -225,9 +259,10 @@ def main() -> None:
         })
         seq += 1
 
-        line = (json.dumps(msg) + "\n").encode()
+        # Frames stay queued if the send fails and go out after the reconnect
+        pending.append(json_line(msg))
         try:
-            sock.sendall(line)
+            send_frames(sock, pending)
         except OSError:
             try:
                 sock.close()
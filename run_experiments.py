@@ -36,6 +36,8 @@ import sys
 import time
 from typing import Any, Dict, List, Optional, Tuple
 
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -70,6 +72,8 @@ EXPERIMENTS: List[Tuple[str, float, float, float, float]] = [
 PALETTE = ["#4c72b0", "#dd8452", "#55a868", "#c44e52", "#8172b2",
            "#937860", "#da8bc3", "#8c8c8c", "#ccb974", "#64b5cd"]
 
+DPI = 150  # output resolution, same as the other analysis scripts
+
 
 # ---------------------------------------------------------------------------
 # Mininet runner
@@ -155,9 +159,9 @@ def compute_metrics(jsonl_path: str) -> Optional[Dict[str, Any]]:
     if not os.path.exists(jsonl_path) or os.path.getsize(jsonl_path) == 0:
         return None
     rows = []
-    with open(jsonl_path, encoding="utf-8") as f:
+    with open(jsonl_path, "rb") as f:      # json.loads takes bytes; no decode/strip per line
         for line in f:
-            if line.strip():
+            if len(line) > 1:
                 try:
                     rows.append(json.loads(line))
                 except json.JSONDecodeError:
@@ -166,17 +170,18 @@ def compute_metrics(jsonl_path: str) -> Optional[Dict[str, Any]]:
         return None
 
     e2e     = [float(r["e2e_ms"]) for r in rows if "e2e_ms" in r]
-    raw     = [bool(r.get("raw_signal", False))   for r in rows]
-    dec     = [bool(r.get("decision", False))      for r in rows]
+    n       = len(rows)
+    raw     = np.fromiter((r.get("raw_signal", False) for r in rows), dtype=np.bool_, count=n)
+    dec     = np.fromiter((r.get("decision", False)   for r in rows), dtype=np.bool_, count=n)
     t_net   = [r.get("thermal_net_ns", 0) / 1e6   for r in rows]
     i_net   = [r.get("imagery_net_ns", 0) / 1e6   for r in rows]
 
     return {
-        "n":             len(rows),
+        "n":             n,
         "mean_e2e_ms":   _mean(e2e),
         "median_e2e_ms": _median(e2e),
-        "raw_rate":      sum(raw) / max(1, len(raw)),
-        "dec_rate":      sum(dec) / max(1, len(dec)),
+        "raw_rate":      float(raw.mean()),
+        "dec_rate":      float(dec.mean()),
         "t_net_mean":    _mean(t_net),
         "i_net_mean":    _mean(i_net),
     }
@@ -243,7 +248,7 @@ def plot_sweeps(outdir: str, experiments: List[Tuple]) -> None:
                         ha="center", fontsize=8, color="#c44e52")
         plt.tight_layout()
         out = os.path.join(sweep_dir, "detection_rate_vs_camera_delay.png")
-        plt.savefig(out, dpi=200, bbox_inches="tight")
+        plt.savefig(out, dpi=DPI, bbox_inches="tight")
         plt.close()
         print(f"  Wrote {out}")
 
@@ -267,7 +272,7 @@ def plot_sweeps(outdir: str, experiments: List[Tuple]) -> None:
         ax.set_axisbelow(True)
         plt.tight_layout()
         out = os.path.join(sweep_dir, "detection_rate_vs_thermal_delay.png")
-        plt.savefig(out, dpi=200, bbox_inches="tight")
+        plt.savefig(out, dpi=DPI, bbox_inches="tight")
         plt.close()
         print(f"  Wrote {out}")
 
@@ -292,7 +297,7 @@ def plot_sweeps(outdir: str, experiments: List[Tuple]) -> None:
                         xytext=(0, 8), ha="center", fontsize=8)
         plt.tight_layout()
         out = os.path.join(sweep_dir, "latency_vs_camera_delay.png")
-        plt.savefig(out, dpi=200, bbox_inches="tight")
+        plt.savefig(out, dpi=DPI, bbox_inches="tight")
         plt.close()
         print(f"  Wrote {out}")
 
@@ -314,7 +319,7 @@ def plot_sweeps(outdir: str, experiments: List[Tuple]) -> None:
         ax.set_axisbelow(True)
         plt.tight_layout()
         out = os.path.join(sweep_dir, "latency_vs_thermal_delay.png")
-        plt.savefig(out, dpi=200, bbox_inches="tight")
+        plt.savefig(out, dpi=DPI, bbox_inches="tight")
         plt.close()
         print(f"  Wrote {out}")
 
@@ -346,7 +351,7 @@ def plot_sweeps(outdir: str, experiments: List[Tuple]) -> None:
     ax.set_axisbelow(True)
     plt.tight_layout()
     out = os.path.join(sweep_dir, "detection_rate_vs_delay_and_loss.png")
-    plt.savefig(out, dpi=200, bbox_inches="tight")
+    plt.savefig(out, dpi=DPI, bbox_inches="tight")
     plt.close()
     print(f"  Wrote {out}")
 
@@ -385,7 +390,7 @@ def plot_sweeps(outdir: str, experiments: List[Tuple]) -> None:
         plt.title("Sweep Experiment Summary", fontsize=13, fontweight="bold", pad=12)
         plt.tight_layout()
         out = os.path.join(sweep_dir, "sweep_summary_table.png")
-        plt.savefig(out, dpi=200, bbox_inches="tight")
+        plt.savefig(out, dpi=DPI, bbox_inches="tight")
         plt.close()
         print(f"  Wrote {out}")
 
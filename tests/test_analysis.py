@@ -0,0 +1,147 @@
+"""
+Unit tests for analyze_latency.py / compare_runs.py log handling — no plots.
+
+Coverage:
+- load_columns(): union of keys across records, missing e2e_ms -> NaN,
+  JSON null in an int column -> the LOG_FIELDS fill, empty log
+- ns_to_ms(): ns int column -> float32 ms
+- extract(): n and percentiles count only events that carry e2e_ms
+- cached_extract(): writes <log>.summary.json, serves it while the stamp
+  matches, recomputes when the log or SUMMARY_VERSION changes
+
+Run:  pytest tests/test_analysis.py -v
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+try:
+    import numpy as np
+    import analyze_latency as A
+    import compare_runs as CR
+except ImportError:  # numpy is required by the analysis scripts only
+    np = None
+
+
+RECORDS = [
+    {"e2e_ms": 120.0, "thermal_net_ns": 10_000_000, "imagery_net_ns": 20_000_000,
+     "thermal_proc_ns": 1_000_000, "imagery_proc_ns": 2_000_000,
+     "fusion_proc_ns": 500_000, "raw_signal": True, "decision": False},
+    # Record without e2e_ms (e.g. written while the field was being added)
+    {"thermal_net_ns": 12_000_000, "imagery_net_ns": 22_000_000,
+     "raw_signal": False, "decision": False},
+    # Null in an i8 column, and a later-phase key only this record carries
+    {"e2e_ms": 80.0, "thermal_net_ns": None, "imagery_net_ns": 15_000_000,
+     "raw_signal": True, "decision": True, "thermal_distance_m": 42.5},
+]
+
+
+def _write_jsonl(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps(r) + "\n")
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestLoadColumns(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "latency_log.jsonl")
+        _write_jsonl(self.path, RECORDS)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_union_of_keys(self):
+        cols = A.load_columns(self.path)
+        self.assertEqual(len(cols), 3)
+        self.assertIn("thermal_distance_m", cols.dtype.names)
+        self.assertNotIn("fire_window", cols.dtype.names)
+        self.assertTrue(np.isnan(cols["thermal_distance_m"][0]))
+        self.assertEqual(cols["thermal_distance_m"][2], 42.5)
+
+    def test_missing_e2e_is_nan(self):
+        cols = A.load_columns(self.path)
+        self.assertEqual(cols["e2e_ms"][0], 120.0)
+        self.assertTrue(np.isnan(cols["e2e_ms"][1]))
+
+    def test_null_int_field_takes_fill(self):
+        cols = A.load_columns(self.path)
+        self.assertEqual(cols["thermal_net_ns"].dtype, np.int64)
+        self.assertEqual(cols["thermal_net_ns"][2], 0)
+        self.assertEqual(cols["fusion_proc_ns"][1], 0)
+
+    def test_empty_log(self):
+        open(self.path, "w").close()
+        self.assertEqual(len(A.load_columns(self.path)), 0)
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestNsToMs(unittest.TestCase):
+    def test_converts_to_float32_ms(self):
+        ms = A.ns_to_ms(np.array([0, 1_500_000, 250_000_000], dtype=np.int64))
+        self.assertEqual(ms.dtype, np.float32)
+        np.testing.assert_allclose(ms, [0.0, 1.5, 250.0], rtol=1e-6)
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestSummaryCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "latency_log.jsonl")
+        self.cache = self.path + CR.SUMMARY_SUFFIX
+        _write_jsonl(self.path, RECORDS)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_extract_counts_only_e2e_events(self):
+        summary = CR.extract(A.load_columns(self.path))
+        self.assertEqual(summary["n"], 2)
+        self.assertAlmostEqual(summary["e2e_mean"], 100.0)
+        self.assertEqual(summary["e2e_p99"], 120.0)
+
+    def test_writes_cache_with_stamp(self):
+        summary = CR.cached_extract(self.path)
+        with open(self.cache, encoding="utf-8") as f:
+            cached = json.load(f)
+        self.assertEqual(cached["stamp"], CR._summary_stamp(self.path))
+        self.assertEqual(cached["stamp"][0], CR.SUMMARY_VERSION)
+        self.assertEqual(cached["summary"], summary)
+
+    def test_fresh_cache_is_served(self):
+        CR.cached_extract(self.path)
+        with open(self.cache, encoding="utf-8") as f:
+            cached = json.load(f)
+        cached["summary"]["n"] = -1  # marker: only the cache can return it
+        with open(self.cache, "w", encoding="utf-8") as f:
+            json.dump(cached, f)
+        self.assertEqual(CR.cached_extract(self.path)["n"], -1)
+
+    def test_changed_log_is_recomputed(self):
+        self.assertEqual(CR.cached_extract(self.path)["n"], 2)
+        _write_jsonl(self.path, RECORDS + [{"e2e_ms": 95.0}])
+        self.assertEqual(CR.cached_extract(self.path)["n"], 3)
+
+    def test_old_summary_version_is_recomputed(self):
+        stamp = CR._summary_stamp(self.path)
+        stamp[0] = CR.SUMMARY_VERSION - 1
+        with open(self.cache, "w", encoding="utf-8") as f:
+            json.dump({"stamp": stamp, "summary": {"n": -1}}, f)
+        self.assertEqual(CR.cached_extract(self.path)["n"], 2)
+
+    def test_corrupt_cache_is_recomputed(self):
+        with open(self.cache, "w", encoding="utf-8") as f:
+            f.write("{not json")
+        self.assertEqual(CR.cached_extract(self.path)["n"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,17 +3,22 @@ Unit tests for controller.py pure logic — no network, no Mininet.
 
 Coverage:
 - safe_max_temp(): 2D grid, 1D list, None, empty
+- thermal_max_temp(): float32 data_b64 payload, legacy data fallback, bounded shape cache
 - imagery_has_fire(): detection list parsing
-- GPS pair matching algorithm (the core of try_evaluate)
-- hit/miss (TP/FN/FP/TN) classification
+- find_best_pair(): GPS pair matching (the core of try_evaluate)
+- classify_hit_miss(): TP/FN/FP/TN classification
 - fused_pairs deduplication
+- split_lines(): newline framing across recv() boundaries
+- _stream_drop_stats(): drop rate from the arrival ring
 
 Run:  pytest tests/test_controller_logic.py -v
 """
 
+import base64
 import os
 import sys
 import unittest
+from array import array
 from collections import deque
 
 REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -54,6 +59,61 @@ class TestSafeMaxTemp(unittest.TestCase):
         self.assertGreater(max_t, C.TEMP_THRESHOLD)
 
 
+class TestThermalMaxTemp(unittest.TestCase):
+    @staticmethod
+    def _b64(values):
+        cells = array("f", values)
+        if sys.byteorder == "big":
+            cells.byteswap()
+        return base64.b64encode(cells.tobytes()).decode("ascii")
+
+    def test_b64_grid(self):
+        msg = {"shape": {"type": "2d", "rows": 2, "cols": 2},
+               "data_b64": self._b64([70.0, 80.0, 90.0, 135.0])}
+        max_t, shape = C.thermal_max_temp(msg)
+        self.assertAlmostEqual(max_t, 135.0, places=4)
+        self.assertEqual(shape, "2x2")
+
+    def test_b64_1d(self):
+        msg = {"shape": {"type": "1d", "len": 3},
+               "data_b64": self._b64([65.0, 102.5, 88.0])}
+        max_t, shape = C.thermal_max_temp(msg)
+        self.assertAlmostEqual(max_t, 102.5, places=4)
+        self.assertEqual(shape, "1d:3")
+
+    def test_b64_large_grid(self):
+        values = [70.0 + (k % 7) for k in range(32 * 32)]
+        values[517] = 142.25
+        msg = {"shape": {"type": "2d", "rows": 32, "cols": 32},
+               "data_b64": self._b64(values)}
+        max_t, shape = C.thermal_max_temp(msg)
+        self.assertAlmostEqual(max_t, 142.25, places=4)
+        self.assertEqual(shape, "32x32")
+
+    def test_bad_b64_is_unknown(self):
+        max_t, shape = C.thermal_max_temp({"data_b64": "abc"})
+        self.assertEqual(max_t, float("-inf"))
+        self.assertEqual(shape, "unknown")
+
+    def test_non_int_shape_falls_back_to_1d(self):
+        msg = {"shape": {"type": "2d", "rows": [2], "cols": "2"},
+               "data_b64": self._b64([70.0, 80.0])}
+        max_t, shape = C.thermal_max_temp(msg)
+        self.assertAlmostEqual(max_t, 80.0, places=4)
+        self.assertEqual(shape, "1d:2")
+
+    def test_shape_cache_is_bounded(self):
+        for rows in range(100):
+            C.thermal_max_temp({"shape": {"type": "2d", "rows": rows, "cols": 1},
+                                "data_b64": self._b64([70.0])})
+        self.assertLessEqual(C._shape_str.cache_info().currsize, 32)
+
+    def test_legacy_data_fallback(self):
+        max_t, shape = C.thermal_max_temp({"data": [[50.0, 150.0]]})
+        self.assertAlmostEqual(max_t, 150.0)
+        self.assertEqual(shape, "1x2")
+
+
 # ---------------------------------------------------------------------------
 # imagery_has_fire
 # ---------------------------------------------------------------------------
@@ -79,30 +139,9 @@ class TestImageryHasFire(unittest.TestCase):
 
 
 # ---------------------------------------------------------------------------
-# GPS pair matching algorithm
-# (same logic as the inner loop of try_evaluate — tested in isolation)
+# GPS pair matching algorithm (find_best_pair, used by try_evaluate)
 # ---------------------------------------------------------------------------
 
-def _find_best_pair(thermal_buf, imagery_buf, threshold_ns: int):
-    """
-    Mirror of try_evaluate's matching loop, extracted for unit testing.
-    Returns (best_t, best_i, best_dt_ns) or (None, None, threshold_ns+1).
-    """
-    best_t = best_i = None
-    best_dt = threshold_ns + 1
-    for t in thermal_buf:
-        t_tx = int(t.get("tx_ns", 0) or 0)
-        for i in imagery_buf:
-            i_tx = int(i.get("tx_ns", 0) or 0)
-            dt = abs(t_tx - i_tx)
-            if dt < best_dt:
-                best_dt = dt
-                best_t, best_i = t, i
-    if best_t is None or best_dt > threshold_ns:
-        return None, None, best_dt
-    return best_t, best_i, best_dt
-
-
 class TestGpsPairMatching(unittest.TestCase):
     BASE_NS = 1_741_000_000_000_000_000  # arbitrary large epoch-like base
 
@@ -113,7 +152,7 @@ class TestGpsPairMatching(unittest.TestCase):
         thermal_buf = [self._msg(0), self._msg(500)]
         imagery_buf = [self._msg(490)]
         threshold = int(250 * 1e6)  # 250ms
-        best_t, best_i, dt = _find_best_pair(thermal_buf, imagery_buf, threshold)
+        best_t, best_i, dt = C.find_best_pair(thermal_buf, imagery_buf, threshold)
         self.assertIsNotNone(best_t)
         self.assertEqual(dt, int(10 * 1e6))   # 10ms apart
 
@@ -121,23 +160,23 @@ class TestGpsPairMatching(unittest.TestCase):
         thermal_buf = [self._msg(0)]
         imagery_buf = [self._msg(300)]  # 300ms apart
         threshold = int(250 * 1e6)     # 250ms threshold
-        best_t, best_i, _ = _find_best_pair(thermal_buf, imagery_buf, threshold)
+        best_t, best_i, _ = C.find_best_pair(thermal_buf, imagery_buf, threshold)
         self.assertIsNone(best_t)
 
     def test_accepts_pair_within_threshold(self):
         thermal_buf = [self._msg(0)]
         imagery_buf = [self._msg(100)]  # 100ms apart
         threshold = int(250 * 1e6)
-        best_t, best_i, dt = _find_best_pair(thermal_buf, imagery_buf, threshold)
+        best_t, best_i, dt = C.find_best_pair(thermal_buf, imagery_buf, threshold)
         self.assertIsNotNone(best_t)
         self.assertEqual(dt, int(100 * 1e6))
 
     def test_empty_thermal_buffer(self):
-        best_t, best_i, _ = _find_best_pair([], [self._msg(0)], int(250 * 1e6))
+        best_t, best_i, _ = C.find_best_pair([], [self._msg(0)], int(250 * 1e6))
         self.assertIsNone(best_t)
 
     def test_empty_imagery_buffer(self):
-        best_t, best_i, _ = _find_best_pair([self._msg(0)], [], int(250 * 1e6))
+        best_t, best_i, _ = C.find_best_pair([self._msg(0)], [], int(250 * 1e6))
         self.assertIsNone(best_t)
 
     def test_exact_threshold_boundary(self):
@@ -145,14 +184,14 @@ class TestGpsPairMatching(unittest.TestCase):
         thermal_buf = [self._msg(0)]
         imagery_buf = [self._msg(250)]  # exactly 250ms = threshold
         threshold = int(250 * 1e6)
-        best_t, best_i, dt = _find_best_pair(thermal_buf, imagery_buf, threshold)
+        best_t, best_i, dt = C.find_best_pair(thermal_buf, imagery_buf, threshold)
         self.assertIsNotNone(best_t, "Pair at exactly the threshold should be accepted")
 
     def test_picks_minimum_dt_from_multiple_candidates(self):
         thermal_buf = [self._msg(0), self._msg(200), self._msg(450)]
         imagery_buf = [self._msg(210)]   # closest to offset=200
         threshold = int(500 * 1e6)
-        best_t, best_i, dt = _find_best_pair(thermal_buf, imagery_buf, threshold)
+        best_t, best_i, dt = C.find_best_pair(thermal_buf, imagery_buf, threshold)
         self.assertIsNotNone(best_t)
         self.assertEqual(dt, int(10 * 1e6))  # 200ms vs 210ms → 10ms apart
 
@@ -161,33 +200,21 @@ class TestGpsPairMatching(unittest.TestCase):
 # Hit / miss classification (TP / FN / FP / TN)
 # ---------------------------------------------------------------------------
 
-def _classify(fire_window: bool, decision: bool) -> str:
-    """Mirror of controller's hit_miss logic."""
-    if fire_window and decision:
-        return "TP"
-    elif fire_window and not decision:
-        return "FN"
-    elif not fire_window and decision:
-        return "FP"
-    else:
-        return "TN"
-
-
 class TestHitMissClassification(unittest.TestCase):
     def test_true_positive(self):
-        self.assertEqual(_classify(True, True), "TP")
+        self.assertEqual(C.classify_hit_miss(True, True), "TP")
 
     def test_false_negative(self):
-        self.assertEqual(_classify(True, False), "FN")
+        self.assertEqual(C.classify_hit_miss(True, False), "FN")
 
     def test_false_positive(self):
-        self.assertEqual(_classify(False, True), "FP")
+        self.assertEqual(C.classify_hit_miss(False, True), "FP")
 
     def test_true_negative(self):
-        self.assertEqual(_classify(False, False), "TN")
+        self.assertEqual(C.classify_hit_miss(False, False), "TN")
 
     def test_all_combinations_covered(self):
-        outcomes = {_classify(fw, dec)
+        outcomes = {C.classify_hit_miss(fw, dec)
                     for fw in (True, False)
                     for dec in (True, False)}
         self.assertEqual(outcomes, {"TP", "FN", "FP", "TN"})
@@ -230,5 +257,90 @@ class TestFusedPairsDedup(unittest.TestCase):
             self.assertIn(p, seen)
 
 
+
+# ---------------------------------------------------------------------------
+# split_lines framing
+# ---------------------------------------------------------------------------
+
+class TestSplitLines(unittest.TestCase):
+    def _collect(self, chunks):
+        """Feed chunks as successive recv() results; return (msgs, leftover)."""
+        msgs = []
+        buf = bytearray()
+        for chunk in chunks:
+            buf += chunk
+            C.split_lines(buf, lambda msg, rx_ns: msgs.append(msg))
+        self.leftover = bytes(buf)
+        return msgs
+
+    def test_one_message_per_chunk(self):
+        msgs = self._collect([b'{"seq": 1}\n', b'{"seq": 2}\n'])
+        self.assertEqual([m["seq"] for m in msgs], [1, 2])
+
+    def test_message_split_across_chunks(self):
+        data = b'{"seq": 1, "data": [1.5, 2.5]}\n{"seq": 2}\n'
+        msgs = self._collect([data[i:i + 3] for i in range(0, len(data), 3)])
+        self.assertEqual([m["seq"] for m in msgs], [1, 2])
+        self.assertEqual(msgs[0]["data"], [1.5, 2.5])
+
+    def test_blank_and_malformed_lines_skipped(self):
+        msgs = self._collect([b'\n  \n{bad json}\n\xff\xfe\n{"seq": 3}\n'])
+        self.assertEqual(msgs, [{"seq": 3}])
+
+    def test_trailing_partial_line_kept_in_buffer(self):
+        msgs = self._collect([b'{"seq": 1}\n{"seq": '])
+        self.assertEqual(msgs, [{"seq": 1}])
+        self.assertEqual(self.leftover, b'{"seq": ')
+
+
+
+# ---------------------------------------------------------------------------
+# _stream_drop_stats over the fixed-size arrival ring
+# ---------------------------------------------------------------------------
+
+class TestStreamDropStats(unittest.TestCase):
+    NOW = 1_000 * 10**9  # arrivals and timestamps are UTC ns
+    S = 10**9
+
+    def _ring(self, times):
+        ring = deque(maxlen=C.ARRIVAL_RING_SIZE)
+        ring.extend(times)
+        return ring
+
+    def test_full_rate_is_zero_drop(self):
+        ring = self._ring(self.NOW - self.S // 2 * k for k in range(19, -1, -1))  # 2 Hz for 10 s
+        drop, recv, exp = C._stream_drop_stats("t", ring, 2.0, self.NOW - 60 * self.S, self.NOW, 10.0)
+        self.assertAlmostEqual(drop, 0.0)
+        self.assertEqual(recv, 20)
+
+    def test_half_rate_is_half_drop(self):
+        ring = self._ring(self.NOW - self.S * k for k in range(9, -1, -1))   # 1 Hz for 10 s
+        drop, _, _ = C._stream_drop_stats("t", ring, 2.0, self.NOW - 60 * self.S, self.NOW, 10.0)
+        self.assertAlmostEqual(drop, 0.5)
+
+    def test_entries_older_than_window_not_counted(self):
+        ring = self._ring([self.NOW - 30 * self.S, self.NOW - 20 * self.S, self.NOW - self.S])
+        _, recv, _ = C._stream_drop_stats("t", ring, 2.0, self.NOW - 60 * self.S, self.NOW, 10.0)
+        self.assertEqual(recv, 1)
+
+    def test_entry_exactly_at_cutoff_counted(self):
+        ring = self._ring([self.NOW - 10 * self.S - 1, self.NOW - 10 * self.S])
+        _, recv, _ = C._stream_drop_stats("t", ring, 2.0, self.NOW - 60 * self.S, self.NOW, 10.0)
+        self.assertEqual(recv, 1)
+
+    def test_counting_leaves_ring_intact(self):
+        ring = self._ring([self.NOW - 30 * self.S, self.NOW - self.S])
+        C._stream_drop_stats("t", ring, 2.0, self.NOW - 60 * self.S, self.NOW, 10.0)
+        self.assertEqual(len(ring), 2)
+
+    def test_ring_capacity_bounds_memory(self):
+        ring = self._ring(self.NOW - 10**6 * k for k in range(10 * C.ARRIVAL_RING_SIZE))
+        self.assertEqual(len(ring), C.ARRIVAL_RING_SIZE)
+
+    def test_not_started(self):
+        drop, _, _ = C._stream_drop_stats("t", self._ring([]), 2.0, None, self.NOW, 10.0)
+        self.assertIsNone(drop)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -46,6 +46,13 @@ class TestUtcIso(unittest.TestCase):
     def test_contains_Z_suffix(self):
         self.assertIn("Z", utc_iso())
 
+    def test_known_timestamp(self):
+        # 2026-01-02T03:04:05.678Z, then a later ms in the same second (cached prefix)
+        ns = 1_767_323_045_678_901_234
+        self.assertEqual(utc_iso(ns), "2026-01-02T03:04:05.678Z")
+        self.assertEqual(utc_iso(ns + 300_000_000), "2026-01-02T03:04:05.978Z")
+        self.assertEqual(utc_iso(ns + 400_000_000), "2026-01-02T03:04:06.078Z")
+
 
 class TestIsFireWindow(unittest.TestCase):
     def test_returns_bool(self):
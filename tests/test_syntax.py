@@ -20,6 +20,7 @@ CORE_FILES = [
     "thermal_worker.py",
     "imagery_worker.py",
     "gps_time.py",
+    "worker_link.py",
     "analyze_latency.py",
     "mn_topo.py",
     "run_experiments.py",
@@ -42,6 +43,7 @@ class TestSyntax(unittest.TestCase):
     def test_thermal_worker(self):     self._compile("thermal_worker.py")
     def test_imagery_worker(self):     self._compile("imagery_worker.py")
     def test_gps_time(self):           self._compile("gps_time.py")
+    def test_worker_link(self):        self._compile("worker_link.py")
     def test_analyze_latency(self):    self._compile("analyze_latency.py")
     def test_mn_topo(self):            self._compile("mn_topo.py")
     def test_run_experiments(self):    self._compile("run_experiments.py")
@@ -66,6 +68,13 @@ class TestImports(unittest.TestCase):
         self.assertTrue(callable(getattr(mod, "is_fire_window", None)))
         self.assertTrue(callable(getattr(mod, "sleep_to_next_tick", None)))
 
+    def test_import_worker_link(self):
+        self._add_root()
+        import importlib
+        mod = importlib.import_module("worker_link")
+        self.assertTrue(callable(getattr(mod, "json_line", None)))
+        self.assertTrue(callable(getattr(mod, "send_frames", None)))
+
     def test_import_thermal_worker(self):
         self._add_root()
         import importlib
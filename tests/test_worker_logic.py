@@ -3,8 +3,12 @@ Unit tests for thermal_worker.py and imagery_worker.py logic.
 
 Key coverage:
 - gen_thermal() / gen_imagery() produce correctly structured messages
+- build_message() float32 wire payload decodes back to the same grid,
+  with and without numpy
 - _random_walk_3d() respects altitude and XY radius bounds
 - _drop_prob_from_distance() returns values in [0, MAX_DROP_PROB]
+- send_frames() delivers single and backlogged frames in order
+- connect() disables Nagle and bounds send stalls on both workers' sockets
 - arg parsing completes without error (this test directly caught the
   Python 3.12 "global used before declaration" SyntaxError)
 
@@ -15,7 +19,14 @@ import os
 import sys
 import math
 import random
+import socket
 import unittest
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if REPO_ROOT not in sys.path:
@@ -29,6 +40,17 @@ import imagery_worker as IW
 # Shared helpers
 # ---------------------------------------------------------------------------
 
+def _max_cell(data) -> float:
+    """Max over a frame: an ndarray, an array('f'), or a list of array('f') rows."""
+    cells = []
+    for x in data:
+        try:
+            cells.extend(x)
+        except TypeError:
+            cells.append(x)
+    return float(max(cells))
+
+
 def _run_walk(module, steps: int = 200):
     """Run the random walk for `steps` iterations and return all positions."""
     random.seed(0)
@@ -54,7 +76,7 @@ class TestThermalGenMessage(unittest.TestCase):
 
     def test_required_keys_present(self):
         # gen_thermal() produces the raw sensor payload; proc_ns / tx_ns are
-        # added later in main() via msg.update({...}).
+        # added later by build_message().
         msg = TW.gen_thermal()
         for key in ("sensor", "data", "fire_sim"):
             self.assertIn(key, msg, f"Missing key '{key}' in gen_thermal()")
@@ -62,10 +84,17 @@ class TestThermalGenMessage(unittest.TestCase):
     def test_sensor_tag_is_thermal(self):
         self.assertEqual(TW.gen_thermal()["sensor"], "thermal")
 
-    def test_data_is_list(self):
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_data_is_array_matching_shape(self):
         for _ in range(20):
             msg = TW.gen_thermal()
-            self.assertIsInstance(msg["data"], list)
+            data, shape = msg["data"], msg["shape"]
+            self.assertIsInstance(data, np.ndarray)
+            self.assertEqual(data.dtype, np.float32)
+            if shape["type"] == "2d":
+                self.assertEqual(data.shape, (shape["rows"], shape["cols"]))
+            else:
+                self.assertEqual(data.shape, (shape["len"],))
 
     def test_fire_sim_is_bool(self):
         for _ in range(20):
@@ -79,18 +108,58 @@ class TestThermalGenMessage(unittest.TestCase):
             msg = TW.gen_thermal()
             if msg["fire_sim"]:
                 found_fire_msg = True
-                flat = []
-                for row in msg["data"]:
-                    if isinstance(row, list):
-                        flat.extend(row)
-                    else:
-                        flat.append(row)
-                self.assertGreater(max(flat), 100.0,
+                self.assertGreater(_max_cell(msg["data"]), 100.0,
                                    "Fire message should have temps > 100°C")
                 break
         self.assertTrue(found_fire_msg, "gen_thermal never produced a fire message in 500 tries")
 
 
+class TestThermalWireMessage(unittest.TestCase):
+    def _check_round_trip(self):
+        import controller as C
+        for seed in range(20):
+            random.seed(seed)
+            frame = TW.gen_thermal()
+            msg = TW.build_message(frame, TW._b64_cells(frame["data"]), seed,
+                                   0, 0, TW.DRONE_START_POS, 1.0, 0.0)
+            self.assertNotIn("data", msg)
+            self.assertIsInstance(msg["data_b64"], str)
+            max_t, shape_str = C.thermal_max_temp(msg)
+            self.assertAlmostEqual(max_t, _max_cell(frame["data"]), places=3)
+            shape = frame["shape"]
+            if shape["type"] == "2d":
+                self.assertEqual(shape_str, f"{shape['rows']}x{shape['cols']}")
+
+    def test_round_trips_through_controller(self):
+        self._check_round_trip()
+
+    def test_round_trips_without_numpy(self):
+        saved = TW.np
+        TW.np = None
+        try:
+            frame = TW.gen_thermal()
+            self.assertNotIsInstance(frame["data"], getattr(np, "ndarray", ()))
+            self._check_round_trip()
+        finally:
+            TW.np = saved
+
+
+class TestThermalRandomHelpers(unittest.TestCase):
+    def test_randbelow_covers_range(self):
+        random.seed(0)
+        seen = {TW._randbelow(4) for _ in range(500)}
+        self.assertEqual(seen, {0, 1, 2, 3})
+
+    def test_hotspot_stays_above_threshold(self):
+        random.seed(0)
+        lo = TW.HOTSPOT_MEAN - 2 * TW.HOTSPOT_STD
+        hi = TW.HOTSPOT_MEAN + 2 * TW.HOTSPOT_STD
+        for _ in range(500):
+            t = TW._hotspot()
+            self.assertTrue(lo <= t <= hi)
+            self.assertGreater(t, 100.0)
+
+
 class TestThermalRandomWalk(unittest.TestCase):
     def test_altitude_within_bounds(self):
         for pos in _run_walk(TW, 500):
@@ -129,6 +198,64 @@ class TestThermalDropProb(unittest.TestCase):
             self.assertGreaterEqual(p, TW.BASE_DROP_PROB)
 
 
+class TestSendFrames(unittest.TestCase):
+    def _roundtrip(self, module, frames):
+        a, b = socket.socketpair()
+        try:
+            pending = deque(frames, maxlen=module.MAX_PENDING_FRAMES)
+            module.send_frames(a, pending)
+            self.assertEqual(len(pending), 0)
+            a.close()
+            got = b""
+            while chunk := b.recv(4096):
+                got += chunk
+            return got
+        finally:
+            a.close()
+            b.close()
+
+    def test_single_frame(self):
+        self.assertEqual(self._roundtrip(TW, [b'{"seq":1}\n']), b'{"seq":1}\n')
+
+    def test_backlog_sent_in_order(self):
+        frames = [b'{"seq":%d}\n' % k for k in range(3)]
+        self.assertEqual(self._roundtrip(IW, frames), b"".join(frames))
+
+    def test_timeout_keeps_only_unsent_frames(self):
+        class StallingSock:
+            """Takes the first frame and 3 bytes of the second, then times out."""
+            def __init__(self, first_send):
+                self.results = [first_send]
+
+            def sendmsg(self, bufs):
+                if not self.results:
+                    raise socket.timeout("timed out")
+                return self.results.pop()
+
+        frames = [b'{"seq":%d}\n' % k for k in range(3)]
+        for module in (TW, IW):
+            pending = deque(frames, maxlen=module.MAX_PENDING_FRAMES)
+            with self.assertRaises(OSError):
+                module.send_frames(StallingSock(len(frames[0]) + 3), pending)
+            self.assertEqual(list(pending), frames[1:])
+
+
+class TestConnect(unittest.TestCase):
+    def test_sockets_disable_nagle_and_bound_sends(self):
+        for module in (TW, IW):
+            with socket.create_server(("127.0.0.1", 0)) as srv:
+                saved_port = module.PORT
+                module.PORT = srv.getsockname()[1]
+                try:
+                    sock = module.connect("127.0.0.1")
+                finally:
+                    module.PORT = saved_port
+                with sock:
+                    self.assertTrue(
+                        sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY))
+                    self.assertEqual(sock.gettimeout(), module.SEND_TIMEOUT_S)
+
+
 class TestThermalArgParsing(unittest.TestCase):
     """
     Verifies that argparse setup (including --base-drop-prob default=BASE_DROP_PROB)
@@ -171,6 +298,13 @@ class TestImageryGenMessage(unittest.TestCase):
         for _ in range(20):
             self.assertIsInstance(IW.gen_imagery()["fire_sim"], bool)
 
+    def test_has_fire_matches_detection_labels(self):
+        for seed in range(200):
+            random.seed(seed)
+            msg = IW.gen_imagery()
+            labels = [d["label"] for d in msg["detections"]]
+            self.assertEqual(msg["has_fire"], "fire" in labels)
+
     def test_fire_detection_has_label(self):
         found = False
         for seed in range(500):
@@ -199,6 +333,13 @@ class TestImageryRandomWalk(unittest.TestCase):
             self.assertLessEqual(xy_dist, IW.XY_MAX_M + 1e-6)
 
 
+class TestImageryRandomHelpers(unittest.TestCase):
+    def test_randint_is_inclusive_and_bounded(self):
+        random.seed(0)
+        seen = {IW._randint(-2, 2) for _ in range(500)}
+        self.assertEqual(seen, {-2, -1, 0, 1, 2})
+
+
 class TestImageryArgParsing(unittest.TestCase):
     def test_main_is_callable(self):
         self.assertTrue(callable(IW.main))
@@ -11,15 +11,26 @@ Sends thermal frames over TCP to controller on port 5001.
 
 from __future__ import annotations
 import argparse
+import base64
 import socket
-import json
 import math
 import time
 import random
 import sys
+from array import array
+from collections import deque
 from typing import Any, Dict, List, Tuple
 
-from gps_time import utc_ns, utc_iso, sleep_to_next_tick, is_fire_window
+from gps_time import utc_ns, sleep_to_next_tick, is_fire_window
+from worker_link import json_line, send_frames
+
+# Optional: numpy draws a whole frame in one Generator call. Without it each
+# cell comes from random.gauss() into array('f') rows, so drone hosts can stay
+# stdlib-only.
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # --- Network ---
 PORT = 5001
@@ -29,9 +40,13 @@ PORT = 5001
 # Phase 5 adds distance-based component on top of this value.
 BASE_DROP_PROB = 0.0      # overridden by --base-drop-prob (default 0 = clean)
 RECONNECT_SLEEP_S = 1.0
+MAX_PENDING_FRAMES = 4    # frames kept across a reconnect; oldest dropped first
 
 # --- Send behavior ---
 SEND_HZ = 2
+# A send that stalls longer than one tick raises instead of blocking the
+# loop; frames not yet handed to the kernel go out again after the reconnect.
+SEND_TIMEOUT_S = 1.0 / SEND_HZ
 
 # --- Temperature model ---
 BASE_MEAN = 70.0
@@ -63,8 +78,23 @@ DRONE_ALT_MAX_M: float = 200.0   # taller range so Z can dominate the 3D distanc
 XY_MAX_M: float = 45.0
 
 
+# Random draws: random.choice()/randrange() are Python-level wrappers around
+# the C generator; these helpers call random.random() directly, so
+# random.seed() still makes runs reproducible.
+_random = random.random
+
+
+def _randbelow(n: int) -> int:
+    """Uniform integer in [0, n), like random.randrange(n)."""
+    return int(_random() * n)
+
+
+def _uniform(lo: float, hi: float) -> float:
+    return lo + (hi - lo) * _random()
+
+
 def _distance_3d(a: Tuple[float, float, float], b: Tuple[float, float, float]) -> float:
-    return math.sqrt(sum((ai - bi) ** 2 for ai, bi in zip(a, b)))
+    return math.hypot(a[0] - b[0], a[1] - b[1], a[2] - b[2])
 
 
 def _drop_prob_from_distance(dist_m: float) -> float:
@@ -78,9 +108,9 @@ def _random_walk_3d(
     step_m: float,
 ) -> Tuple[float, float, float]:
     """Move drone by a random step in 3D; clamp altitude and XY radius."""
-    dx = random.uniform(-step_m, step_m)
-    dy = random.uniform(-step_m, step_m)
-    dz = random.uniform(-step_m / 2, step_m / 2)
+    dx = _uniform(-step_m, step_m)
+    dy = _uniform(-step_m, step_m)
+    dz = _uniform(-step_m / 2, step_m / 2)
     x, y, z = pos[0] + dx, pos[1] + dy, pos[2] + dz
     # Clamp altitude
     z = max(DRONE_ALT_MIN_M, min(DRONE_ALT_MAX_M, z))
@@ -92,14 +122,45 @@ def _random_walk_3d(
     return (x, y, z)
 
 
-def _gen_grid(r: int, c: int) -> List[List[float]]:
-    grid = [[random.gauss(BASE_MEAN, BASE_STD) for _ in range(c)] for _ in range(r)]
-    return grid
+# With numpy, temperatures come from a Generator: one C call fills a whole
+# frame instead of a random.gauss() per cell. main() reseeds it from --seed.
+_rng = np.random.default_rng() if np is not None else None
+_gauss = random.gauss
+
+
+# Frames are float32 from generation to the wire. The sensor is only good to
+# about 1 degC, so float32 rounding (~1e-5 degC at these temperatures) is noise.
+def _gen_normal(size, mean: float) -> Any:
+    cells = _rng.standard_normal(size, dtype=np.float32)
+    cells *= BASE_STD
+    cells += mean
+    return cells
+
+
+def _gen_row(n: int, mean: float) -> array:
+    return array("f", [_gauss(mean, BASE_STD) for _ in range(n)])
+
+
+def _gen_grid(r: int, c: int, mean: float = BASE_MEAN) -> Any:
+    """r x c frame: a 2-D ndarray, or a list of array('f') rows without numpy."""
+    if np is None:
+        return [_gen_row(c, mean) for _ in range(r)]
+    return _gen_normal((r, c), mean)
 
 
-def _gen_1d(n: int) -> List[float]:
-    arr = [random.gauss(BASE_MEAN, BASE_STD) for _ in range(n)]
-    return arr
+def _gen_1d(n: int, mean: float = BASE_MEAN) -> Any:
+    if np is None:
+        return _gen_row(n, mean)
+    return _gen_normal(n, mean)
+
+
+def _hotspot() -> float:
+    """
+    One hotspot cell, uniform within HOTSPOT_MEAN +/- 2*HOTSPOT_STD. The
+    controller only compares against its threshold, so the distribution's
+    shape is cosmetic; a scalar numpy draw costs ~10x a random.random().
+    """
+    return _uniform(HOTSPOT_MEAN - 2 * HOTSPOT_STD, HOTSPOT_MEAN + 2 * HOTSPOT_STD)
 
 
 def gen_thermal() -> Dict[str, Any]:
@@ -113,36 +174,34 @@ def gen_thermal() -> Dict[str, Any]:
     """
     in_fire = is_fire_window()
     if in_fire:
-        fire_sim = random.random() < 0.85
+        fire_sim = _random() < 0.85
     else:
-        fire_sim = random.random() < 0.10
+        fire_sim = _random() < 0.10
 
-    send_1d = (random.random() < P_SEND_1D)
+    send_1d = (_random() < P_SEND_1D)
+    # Fire inflates the whole baseline: draw around the shifted mean in the
+    # same pass instead of adding FIRE_INFLATION over the frame afterwards
+    mean = BASE_MEAN + FIRE_INFLATION if fire_sim else BASE_MEAN
 
     if send_1d:
-        n = random.choice(LENS_1D)
-        data = _gen_1d(n)
+        n = LENS_1D[_randbelow(len(LENS_1D))]
+        data = _gen_1d(n, mean)
 
         if fire_sim:
-            # Inflate baseline
-            data = [x + FIRE_INFLATION for x in data]
             # Add a hotspot at a random index
-            idx = random.randrange(n)
-            data[idx] = random.gauss(HOTSPOT_MEAN, HOTSPOT_STD)
+            idx = _randbelow(n)
+            data[idx] = _hotspot()
 
         shape = {"type": "1d", "len": n}
     else:
-        r, c = random.choice(SHAPES_2D)
-        grid = _gen_grid(r, c)
+        r, c = SHAPES_2D[_randbelow(len(SHAPES_2D))]
+        grid = _gen_grid(r, c, mean)
 
         if fire_sim:
-            # Inflate baseline + insert a hotspot somewhere
-            for i in range(r):
-                for j in range(c):
-                    grid[i][j] += FIRE_INFLATION
-            hi = random.randrange(r)
-            hj = random.randrange(c)
-            grid[hi][hj] = random.gauss(HOTSPOT_MEAN, HOTSPOT_STD)
+            # Insert a hotspot somewhere
+            hi = _randbelow(r)
+            hj = _randbelow(c)
+            grid[hi][hj] = _hotspot()
 
         data = grid
         shape = {"type": "2d", "rows": r, "cols": c}
@@ -155,19 +214,75 @@ def gen_thermal() -> Dict[str, Any]:
     }
 
 
+def _b64_cells(data: Any) -> str:
+    """Cells as base64 little-endian float32, row-major (the `data_b64` field)."""
+    if np is not None:
+        raw = np.asarray(data, dtype="<f4").tobytes()
+    else:
+        cells = array("f")
+        for row in (data if type(data) is list else (data,)):
+            cells.extend(row)
+        if sys.byteorder == "big":
+            cells.byteswap()
+        raw = cells.tobytes()
+    return base64.b64encode(raw).decode("ascii")
+
+
+def build_message(
+    frame: Dict[str, Any],
+    data_b64: str,
+    seq: int,
+    tx_ns: int,
+    proc_ns: int,
+    drone_pos: Tuple[float, float, float],
+    dist_m: float,
+    drop_prob: float,
+) -> Dict[str, Any]:
+    """
+    The wire message for one generated frame, built in one literal rather than
+    grown with update(): every key is known here, so the dict is sized once.
+    """
+    return {
+        "sensor": "thermal",
+        "shape": frame["shape"],
+        "data_b64": data_b64,
+        "fire_sim": frame["fire_sim"],
+        "seq": seq,
+        "tx_ns": tx_ns,
+        "proc_ns": proc_ns,
+        # Ground-truth fire label: was the fire window active when this
+        # message was sent?  Controller uses this for hit/miss accounting.
+        "fire_window": is_fire_window(),
+        # Phase 5: drone telemetry. The wire is JSON, so rounding keeps each
+        # value to a few digits instead of ~18 (distance_m also ends up in
+        # the controller's CSV/JSONL logs)
+        "drone_x": round(drone_pos[0], 2),
+        "drone_y": round(drone_pos[1], 2),
+        "drone_z": round(drone_pos[2], 2),
+        "distance_m": round(dist_m, 2),
+        "drop_prob": round(drop_prob, 4),
+    }
+
+
 def connect(host: str) -> socket.socket:
     """Phase 2 robustness: keep trying until controller accepts."""
     while True:
         try:
             s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             s.connect((host, PORT))
+            # Only sends are bounded: the handshake on a high-delay link can
+            # take longer than one tick
+            s.settimeout(SEND_TIMEOUT_S)
+            # One small frame per tick: send it now instead of letting Nagle
+            # hold it back waiting for the previous frame's ACK
+            s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             return s
         except OSError:
             time.sleep(RECONNECT_SLEEP_S)
 
 
 def main() -> None:
-    global BASE_DROP_PROB
+    global BASE_DROP_PROB, _rng
     parser = argparse.ArgumentParser(description="Thermal Worker")
     parser.add_argument("host", help="Controller IP address")
     parser.add_argument(
@@ -187,6 +302,8 @@ def main() -> None:
 
     if args.seed is not None:
         random.seed(args.seed)
+        if np is not None:
+            _rng = np.random.default_rng(args.seed)
         print(f"[THERMAL] Random seed set to {args.seed}")
 
     BASE_DROP_PROB = args.base_drop_prob
@@ -200,6 +317,7 @@ def main() -> None:
     drone_pos: Tuple[float, float, float] = DRONE_START_POS
 
     sock = connect(host)
+    pending: deque = deque(maxlen=MAX_PENDING_FRAMES)
     print(f"[THERMAL] Connected. Start pos={drone_pos}")
 
     while True:
@@ -209,37 +327,28 @@ def main() -> None:
         drop_prob = _drop_prob_from_distance(dist_m)
 
         # Phase 2 + 5: dropout (now distance-aware)
-        if random.random() < drop_prob:
+        if _random() < drop_prob:
             sleep_to_next_tick(period)
             seq += 1
             continue
 
         proc_start_ns = utc_ns()
-        msg = gen_thermal()
+        frame = gen_thermal()
+        data_b64 = _b64_cells(frame["data"])
         proc_end_ns = utc_ns()
+        # Generation ends microseconds before the send: one clock read serves
+        # both, and the controller derives ISO strings from tx_ns if it needs them
+        tx_ns = proc_end_ns
 
-        tx_ns = utc_ns()
-        msg.update({
-            "seq": seq,
-            "tx_ns": tx_ns,
-            "tx_iso": utc_iso(tx_ns),
-            "proc_ns": int(proc_end_ns - proc_start_ns),
-            # Ground-truth fire label: was the fire window active when this
-            # message was sent?  Controller uses this for hit/miss accounting.
-            "fire_window": is_fire_window(),
-            # Phase 5: drone telemetry
-            "drone_x": round(drone_pos[0], 2),
-            "drone_y": round(drone_pos[1], 2),
-            "drone_z": round(drone_pos[2], 2),
-            "distance_m": round(dist_m, 2),
-            "drop_prob": round(drop_prob, 4),
-        })
+        msg = build_message(frame, data_b64, seq, tx_ns,
+                            int(proc_end_ns - proc_start_ns),
+                            drone_pos, dist_m, drop_prob)
         seq += 1
 
-        line = (json.dumps(msg) + "\n").encode()
-
+        # Frames not yet sent stay queued and go out after the reconnect
+        pending.append(json_line(msg))
         try:
-            sock.sendall(line)
+            send_frames(sock, pending)
         except OSError:
             try:
                 sock.close()
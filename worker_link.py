@@ -0,0 +1,44 @@
+"""
+Worker Link Helpers — shared by thermal_worker.py and imagery_worker.py
+
+Exposes:
+- json_line(obj): compact, newline-terminated JSON bytes (orjson if installed)
+- send_frames(sock, pending): vectored send of queued frames, oldest first
+"""
+
+from __future__ import annotations
+import json
+import socket
+from collections import deque
+from typing import Any, Dict
+
+# Optional: orjson serialises several times faster than stdlib json; both
+# produce compact, newline-terminated bytes.
+try:
+    import orjson
+
+    def json_line(obj: Dict[str, Any]) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    def json_line(obj: Dict[str, Any]) -> bytes:
+        return (json.dumps(obj, separators=(",", ":")) + "\n").encode()
+
+
+def send_frames(sock: socket.socket, pending: deque) -> None:
+    """
+    Send every queued frame, oldest first, with vectored sendmsg() (a backlog
+    left by a reconnect goes out in one call). Each frame leaves the queue as
+    soon as the kernel has taken all of it, so if a send raises, only frames
+    not yet fully handed over stay queued. A frame cut off mid-send is resent
+    whole on the next connection; the controller drops the partial line when
+    the old one closes.
+    """
+    offset = 0  # bytes of pending[0] already sent
+    while pending:
+        bufs = list(pending)
+        if offset:
+            bufs[0] = memoryview(bufs[0])[offset:]
+        sent = offset + sock.sendmsg(bufs)
+        while pending and sent >= len(pending[0]):
+            sent -= len(pending.popleft())
+        offset = sent